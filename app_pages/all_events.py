@@ -1,9 +1,18 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from modules.ui_utils import render_mini_map 
-
-def show_all_events(get_data):
+from modules.ui_utils import render_mini_map, paginate
+from modules.event_cards import load_event_cards, card_value
+from modules.search_index import load_search_index
+
+# Archive sort options -> server-side order (column, descending)
+SORT_ORDERS = {
+    "Newest First": ("Date", True),
+    "Oldest First": ("Date", False),
+    "Rent (High)": ("Rent", True),
+}
+
+def show_all_events(get_data, db):
     # --- 🎨 1. CSS STYLING (Matching Home Dashboard) ---
     st.markdown("""
         <style>
@@ -28,25 +37,24 @@ def show_all_events(get_data):
     st.write("Complete searchable history of all venue bookings.")
 
     # --- 🛰️ 2. DATA ACQUISITION ---
-    df = get_data("Events")
-    df_log_all = get_data("Logistics_Details")
-    df_fin_all = get_data("Event_Financials")
-    df_con_all = get_data("Event_Contacts")
-    df_rep_all = get_data("Event_Reports")
+    # One card row per event from the event_summary view. The sort is part of
+    # the query, so "Rent (High)" is a plain ordered read (cached per order).
+    sort_order = st.session_state.get("archive_sort", "Best Match")
+    df = load_event_cards(get_data, order=SORT_ORDERS.get(sort_order, SORT_ORDERS["Newest First"]))
 
     if df.empty:
         st.info("No records found."); return
 
-    # Clean Dates
-    df['Date'] = pd.to_datetime(df['Date'], dayfirst=True, errors='coerce')
-    df['End_Date'] = pd.to_datetime(df.get('End_Date', df['Date']), dayfirst=True, errors='coerce')
+    # Dates arrive as Timestamps already (typed once at load, see modules/schema.py)
+    if 'End_Date' not in df.columns:
+        df['End_Date'] = df['Date']
     df = df.dropna(subset=['Date'])
 
     # --- 🛠️ 3. ADVANCED SEARCH & FILTERS ---
     with st.container(border=True):
         c1, c2, c3, c4 = st.columns([2, 1, 1, 1])
         
-        search_query = c1.text_input("🔍 Global Search", placeholder="Venue, ID, or Contact...").lower()
+        search_query = c1.text_input("🔍 Global Search", placeholder="Venue, ID, Address, Organiser or Contact...").lower()
         
         # Filter by Type
         types = ["All"] + sorted(df['Event_Type'].dropna().unique().tolist())
@@ -57,17 +65,17 @@ def show_all_events(get_data):
         year_filter = c3.selectbox("📅 Year", years)
 
         # Sort Order
-        sort_order = c4.selectbox("🔃 Sort", ["Newest First", "Oldest First", "Rent (High)"])
+        sort_order = c4.selectbox("🔃 Sort", ["Best Match", *SORT_ORDERS], key="archive_sort")
 
     # --- 🧪 4. FILTERING LOGIC ---
     filtered_df = df.copy()
 
-    if search_query:
-        # Check Venue and Event_ID
-        filtered_df = filtered_df[
-            filtered_df['Venue'].str.lower().str.contains(search_query) |
-            filtered_df['Event_ID'].str.lower().str.contains(search_query)
-        ]
+    # Token index over venue, ID, address, organiser and every contact name
+    # (prefix + typo-tolerant matching), built once per data version - and
+    # only loaded when there is something to search for
+    scores = load_search_index(get_data, db).search(search_query) if search_query.strip() else None
+    if scores is not None:
+        filtered_df = filtered_df[filtered_df['Event_ID'].isin(scores.keys())]
 
     if type_filter != "All":
         filtered_df = filtered_df[filtered_df['Event_Type'] == type_filter]
@@ -75,31 +83,24 @@ def show_all_events(get_data):
     if year_filter != "All":
         filtered_df = filtered_df[filtered_df['Date'].dt.year == int(year_filter)]
 
-    # Sorting
-    if sort_order == "Newest First":
-        filtered_df = filtered_df.sort_values('Date', ascending=False)
-    elif sort_order == "Oldest First":
-        filtered_df = filtered_df.sort_values('Date', ascending=True)
-    elif sort_order == "Rent (High)":
-        # Merge rent to sort
-        filtered_df = filtered_df.merge(df_fin_all[['Event_ID', 'Rent']], on="Event_ID", how="left")
-        filtered_df = filtered_df.sort_values('Rent', ascending=False)
+    # Rows arrive sorted by the query; "Best Match" ranks by search score
+    # (stable, so ties keep newest first) and is newest first without a search
+    if sort_order == "Best Match" and scores:
+        filtered_df = filtered_df.assign(_score=filtered_df['Event_ID'].map(scores))
+        filtered_df = filtered_df.sort_values('_score', ascending=False, kind='stable').drop(columns='_score')
 
     # --- 🖼️ 5. GRID RENDERER (Archive Version) ---
     st.write(f"Showing **{len(filtered_df)}** events")
+
+    # Only the current page of cards is rendered
+    page_df = paginate(filtered_df, "archive", reset_on=(search_query, type_filter, year_filter, sort_order))
     
     grid_cols = st.columns(3)
     
-    for idx, row in filtered_df.reset_index().iterrows():
+    for idx, row in page_df.reset_index().iterrows():
         eid = row['Event_ID']
         address = row.get('Address', row['Venue'])
         
-        # Cross-reference
-        fin = df_fin_all[df_fin_all['Event_ID'] == eid].iloc[0] if not df_fin_all[df_fin_all['Event_ID'] == eid].empty else {}
-        con = df_con_all[(df_con_all['Event_ID'] == eid)].iloc[0] if not df_con_all[df_con_all['Event_ID'] == eid].empty else {}
-        log_match = df_log_all[df_log_all['Event_ID'] == eid]
-        rep_match = df_rep_all[df_rep_all['Event_ID'] == eid]
-
         with grid_cols[idx % 3]:
             with st.container(border=True):
                 # Title & ID
@@ -114,18 +115,17 @@ def show_all_events(get_data):
 
                 # Contact & Rent Status
                 c1, c2 = st.columns([2, 1])
-                c1.caption(f"👤 {con.get('Name', 'Imported')}")
-                r_stat = fin.get('Rent_Status', 'Paid')
+                c1.caption(f"👤 {card_value(row, 'First_Contact_Name', 'Imported')}")
+                r_stat = card_value(row, 'Rent_Status', 'Paid')
                 r_col = "#28a745" if r_stat == "Paid" else "#ffc107" 
                 c2.markdown(f"<p style='text-align:right; margin:0;'><span class='status-badge' style='background-color:{r_col};'>💰 {r_stat}</span></p>", unsafe_allow_html=True)
 
                 # Logistics Box
-                if not log_match.empty:
-                    log = log_match.iloc[0]
+                if row['Has_Logistics']:
                     st.markdown(f"""
                         <div class="logistics-box">
-                            <p style="margin:0; font-size: 0.85rem;">🚚 <b>{log.get('Setup_Type', 'Standard')}</b></p>
-                            <p style="margin:0; font-size: 0.75rem;">🔽 In: {log.get('Bump_In', '--')} | 🔼 Out: {log.get('Bump_Out', '--')}</p>
+                            <p style="margin:0; font-size: 0.85rem;">🚚 <b>{card_value(row, 'Setup_Type', 'Standard')}</b></p>
+                            <p style="margin:0; font-size: 0.75rem;">🔽 In: {card_value(row, 'Bump_In', '--')} | 🔼 Out: {card_value(row, 'Bump_Out', '--')}</p>
                         </div>
                     """, unsafe_allow_html=True)
                 else:
@@ -133,9 +133,8 @@ def show_all_events(get_data):
 
                 # Weather or Report Status
                 # Weather or Forecast
-                if not rep_match.empty:
-                    rep = rep_match.iloc[0]
-                    st.success(f"☀️ **Recorded:** {rep.get('Weather', 'Sunny')}")
+                if row['Has_Report']:
+                    st.success(f"☀️ **Recorded:** {card_value(row, 'Weather', 'Sunny')}")
                 else:
                     search_q = f"weather+at+{str(address).replace(' ', '+')}+on+{row['Date'].strftime('%Y-%m-%d')}"
                     st.markdown(f"""
@@ -147,7 +146,7 @@ def show_all_events(get_data):
                     """, unsafe_allow_html=True)
 
                 # Mini Map
-                render_mini_map(address)
+                render_mini_map(address, key=f"arch_{eid}", lazy=True)
                 
                 # Open Workspace
                 if st.button("📂 Open Workspace", key=f"arch_{eid}_{idx}", use_container_width=True):
@@ -1,9 +1,8 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, timedelta
 import re
 
-def show_create_event(get_data, conn):
+def show_create_event(get_data, db):
     if st.session_state.user_role != "Admin" and st.session_state.user_role != "Manager":
         st.error("Access Denied.")
         st.session_state.page = "🏠 Home Dashboard"
@@ -128,11 +127,16 @@ def show_create_event(get_data, conn):
                     # conn.update(worksheet="Logistics_Details", data=pd.concat([get_data("Logistics_Details"), pd.DataFrame([row_logistics])], ignore_index=True))
                     # conn.update(worksheet="Event_Contacts", data=pd.concat([get_data("Event_Contacts"), pd.DataFrame([row_contact])], ignore_index=True))
                     ##### new supabse code #######
-                    # APPEND DATA
-                    db.update_table("Events", pd.concat([get_data("Events"), pd.DataFrame([row_event])], ignore_index=True))
-                    db.update_table("Event_Financials", pd.concat([get_data("Event_Financials"), pd.DataFrame([row_finance])], ignore_index=True))
-                    db.update_table("Logistics_Details", pd.concat([get_data("Logistics_Details"), pd.DataFrame([row_logistics])], ignore_index=True))
-                    db.update_table("Event_Contacts", pd.concat([get_data("Event_Contacts"), pd.DataFrame([row_contact])], ignore_index=True))
+                    # APPEND DATA (stop at the first failed insert and undo the rows already saved)
+                    saved = []
+                    for sheet, row in [("Events", row_event), ("Event_Financials", row_finance),
+                                       ("Logistics_Details", row_logistics), ("Event_Contacts", row_contact)]:
+                        if not db.insert_row(sheet, row):
+                            for done in reversed(saved):
+                                db.delete_rows(done, {"Event_ID": eid})
+                            status.update(label=f"❌ Could not save {sheet.replace('_', ' ')} - event not created.", state="error")
+                            st.stop()
+                        saved.append(sheet)
                     ##### new supabase code end #####
 
 
@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 import re
 
 def show_create_staff(get_data, conn):
@@ -8,7 +7,6 @@ def show_create_staff(get_data, conn):
     # --- 🛡️ 1. DATA CACHING ---
     # We pull data once per session or every few minutes to stop the "Loading" loop
     df_staff_db = get_data("Staff_Database")
-    df_staff_auth = get_data("Staff")
 
     # --- 2. CORE INFO (Outside form to keep it snappy) ---
     st.subheader("📋 Personal & Contact Details")
@@ -66,19 +64,22 @@ def show_create_staff(get_data, conn):
                     "Rating": 5.0, "Hourly_Rate": s_rate, "Skills": s_skills, "TFN": s_tfn
                 }
                 
+                # Append to Staff_Database table (first, so a login never exists without it)
+                if not conn.insert_row("Staff_Database", new_db):
+                    st.error(f"Could not save {s_name} - staff member not created.")
+                    return
+
                 # --- 💾 AUTH RECORD ---
                 if enable_app:
                     new_auth = {
                         "Email": login_email, "Name": s_name, "Role": s_role,
                         "PIN": s_pin, "Type": "Casual", "Phone": s_phone
                     }
-                    # Update Staff Sheet
-                    updated_auth = pd.concat([df_staff_auth, pd.DataFrame([new_auth])], ignore_index=True)
-                    conn.update(worksheet="Staff", data=updated_auth)
-
-                # Update Database Sheet
-                updated_db = pd.concat([df_staff_db, pd.DataFrame([new_db])], ignore_index=True)
-                conn.update(worksheet="Staff_Database", data=updated_db)
+                    # Append to Staff table (undo the record above if the login can't be saved)
+                    if not conn.insert_row("Staff", new_auth):
+                        conn.delete_rows("Staff_Database", {"Staff_Name": s_name})
+                        st.error(f"Could not create the app login for {s_name} - staff member not created.")
+                        return
 
                 st.success(f"Successfully initialized {s_name}!")
                 st.balloons()
\ No newline at end of file
@@ -4,38 +4,38 @@ import pandas as pd
 from datetime import datetime
 
 # --- 📦 MODULAR IMPORTS ---
+from modules.event_bundle import load_event_bundle
 from app_pages.workspace_tabs.tab_overview import render_overview_tab
 from app_pages.workspace_tabs.tab_logistics import render_logistics_tab
 from app_pages.workspace_tabs.tab_reports import render_reports_tab
 from app_pages.workspace_tabs.tab_staffing import render_staffing_tab
 from app_pages.workspace_tabs.tab_sales import render_sales_tab
 
+# Workspace sections, in selector order
+WORKSPACE_SECTIONS = ["📊 Overview", "🚛 Logistics", "📝 Daily Report", "👥 Staffing", "💰 Sales"]
+
 def show_event_workspace(eid, get_data, db):
     """
     MASTER CONTROLLER: show_event_workspace
     Handles data acquisition and tab routing.
     """
     # --- 🛡️ 1. DATA ACQUISITION ---
-    df_events = get_data("Events")
-    event_match = df_events[df_events['Event_ID'].astype(str) == str(eid)]
+    bundle = load_event_bundle(str(eid), db)
     
-    if event_match.empty:
+    if bundle.event is None:
         st.error(f"Event ID {eid} not found.")
         return
     
-    event_core = event_match.iloc[0].copy()
+    event_core = bundle.event.copy()
     is_adm = st.session_state.get('user_role') == "Admin"
 
     # --- 📅 2. DATE LOGIC (Updated for ISO Accuracy) ---
     try:
-        # Explicitly telling pandas to treat this as Year-Month-Day
-        start_dt = pd.to_datetime(event_core['Date'], errors='coerce', format='ISO8601') 
+        # Date / End_Date are parsed as ISO Timestamps at load time (NaT if blank)
+        start_dt = event_core['Date']
         
         end_val = event_core.get('End_Date')
-        if pd.isna(end_val) or end_val == "" or str(end_val).lower() == "none":
-            end_dt = start_dt
-        else:
-            end_dt = pd.to_datetime(end_val, errors='coerce', format='ISO8601')
+        end_dt = start_dt if pd.isna(end_val) else end_val
 
         if pd.notna(start_dt) and pd.notna(end_dt):
             date_range = pd.date_range(start=start_dt, end=end_dt).date.tolist()
@@ -66,26 +66,31 @@ def show_event_workspace(eid, get_data, db):
         if selection: 
             selected_report_date = selection
 
-    # --- 📑 TAB DEFINITION ---
-    tab_ov, tab_log, tab_rep, tab_staff, tab_sales = st.tabs([
-        "📊 Overview", "🚛 Logistics", "📝 Daily Report", "👥 Staffing", "💰 Sales"
-    ])
+    # --- 📑 SECTION SELECTOR ---
+    # Only the section on screen runs (st.tabs executed all five every rerun)
+    section = st.segmented_control(
+        "Workspace Section",
+        options=WORKSPACE_SECTIONS,
+        default="📊 Overview",
+        key="workspace_section",
+        label_visibility="collapsed",
+    ) or "📊 Overview"
     
     # --- 🚀 MODULE ROUTING ---
-    with tab_ov:
-        render_overview_tab(eid, event_core, df_events, db, get_data, is_adm)
+    if section == "📊 Overview":
+        render_overview_tab(eid, db, is_adm)
 
-    with tab_log:
-        render_logistics_tab(eid, db, get_data, is_adm)
+    elif section == "🚛 Logistics":
+        render_logistics_tab(eid, db, is_adm)
 
-    with tab_rep:
-        render_reports_tab(eid, selected_report_date, db, get_data)
+    elif section == "📝 Daily Report":
+        render_reports_tab(eid, selected_report_date, db)
 
-    with tab_staff:
+    elif section == "👥 Staffing":
         render_staffing_tab(eid, db, get_data, is_adm)
 
-    with tab_sales:
-        render_sales_tab(eid, selected_report_date, db, get_data)
+    elif section == "💰 Sales":
+        render_sales_tab(eid, selected_report_date, db, bundle)
 
 ### end new code 1.1 ### 
 
@@ -1,5 +1,10 @@
 import streamlit as st
-import pandas as pd
+
+# Rollup grains offered for the trend chart
+TREND_GRAINS = {"Daily": "day", "Weekly": "week", "Monthly": "month"}
+
+# Rollup dimensions offered for the breakdown chart
+BREAKDOWNS = {"Venue": "Venue", "Event Type": "Event_Type", "Setup Type": "Setup_Type"}
 
 def show_history(get_data, db):
     st.title("📜 Historic Archives")
@@ -7,32 +12,44 @@ def show_history(get_data, db):
 
     # Fetch data from Supabase modules
     df = get_data("Events")
-    df_fin = get_data("Event_Financials")
+
+    # Revenue comes pre-aggregated by day/week/month x venue/type/setup,
+    # maintained by a trigger on every sales save (sql/revenue_rollup.sql)
+    df_roll = get_data("Revenue_Rollup")
 
     if df.empty:
         st.warning("No historic data available."); return
 
     # --- 📊 STATISTICS SECTION ---
-    if not df_fin.empty:
-        # Note: In your Supabase SQL, the column is 'total_revenue' 
-        # based on Table 8 or calculated fields.
-        rev_col = 'total_revenue' if 'total_revenue' in df_fin.columns else 'Total_Sales'
-        
-        if rev_col in df_fin.columns:
-            total_revenue = pd.to_numeric(df_fin[rev_col], errors='coerce').sum()
-            st.metric("Total Historic Revenue", f"${total_revenue:,.2f}")
-        else:
-            st.metric("Total Historic Revenue", "$0.00", help="Revenue column not found")
+    if df_roll.empty:
+        st.metric("Total Historic Revenue", "$0.00", help="No sales recorded yet")
+    else:
+        df_month = df_roll[df_roll['Grain'] == 'month']
+        seasons = sorted(df_month['Period'].dt.year.unique().tolist(), reverse=True)
+
+        s_col, m1, m2 = st.columns([1, 1, 1])
+        season = s_col.selectbox("📅 Season", seasons)
+        df_season = df_month[df_month['Period'].dt.year == season]
+
+        m1.metric("Total Historic Revenue", f"${df_month['Revenue'].sum():,.2f}")
+        m2.metric(f"{season} Season Revenue", f"${df_season['Revenue'].sum():,.2f}")
+
+        # --- 📈 TRENDS ---
+        t_col, b_col = st.columns(2)
+        with t_col:
+            grain = st.segmented_control("Revenue Trend", list(TREND_GRAINS), default="Weekly") or "Weekly"
+            df_trend = df_roll[(df_roll['Grain'] == TREND_GRAINS[grain]) & (df_roll['Period'].dt.year == season)]
+            st.bar_chart(df_trend.groupby('Period')['Revenue'].sum())
+
+        with b_col:
+            dim = st.segmented_control("Breakdown", list(BREAKDOWNS), default="Venue") or "Venue"
+            st.bar_chart(df_season.groupby(BREAKDOWNS[dim])['Revenue'].sum().sort_values(ascending=False), horizontal=True)
 
     # --- 🗂️ DATA TABLE ---
     st.write("### Raw Archive Data")
     # We display the events dataframe. 
     # Streamlit's st.dataframe handles the display perfectly.
     st.dataframe(df, use_container_width=True, hide_index=True)
-    
-    # Space for future charts
-    if not df_fin.empty:
-        st.info("💡 Pro Tip: You can now add Plotly charts here to track revenue trends over time.")
 # import streamlit as st
 # import pandas as pd
 
@@ -1,7 +1,9 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-from modules.ui_utils import render_mini_map 
+from modules.ui_utils import render_event_map, paginate
+from modules.event_cards import load_event_cards, card_value
+from modules.venues import venue_points
 
 # --- IMPORTANT: We removed the GSheets import and the 'conn' creation here ---
 # Everything is now passed in from main.py via the 'db' object.
@@ -36,53 +38,54 @@ def show_home(get_data, db):
         st.markdown(f"<div style='text-align: right; color: gray; padding-top:20px;'>🕒 {now}</div>", unsafe_allow_html=True)
 
     # --- 🛰️ 2. DATA ACQUISITION ---
-    # These now use your Supabase-powered get_data function automatically
-    df = get_data("Events")
-    df_log_all = get_data("Logistics_Details")
-    df_fin_all = get_data("Event_Financials")
-    df_con_all = get_data("Event_Contacts")
-    df_reports_all = get_data("Event_Reports")
+    # These now use your Supabase-powered get_data function automatically.
+    # The hub only shows the last 30 days onwards, so filter on the server
+    # and only pull the columns the cards display.
+    # Each row is one ready-made "card" from the event_summary view (rent,
+    # primary contact, logistics, weather), cached until a source table is written.
+    today = datetime.now().date()
+    past_limit = today - timedelta(days=30)
+    df = load_event_cards(get_data, date_range=("Date", past_limit, None))
 
     if df.empty:
-        st.info("No events found in the database."); return
+        st.info("No recent or upcoming events found."); return
 
-    # ✅ Date Cleaning (Post-Supabase)
-    # Note: Supabase often returns strings (YYYY-MM-DD), so we ensure they are Timestamps
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    # ✅ Dates arrive as Timestamps already (typed once at load, see modules/schema.py)
     if 'End_Date' not in df.columns:
         df['End_Date'] = df['Date']
-    else:
-        df['End_Date'] = pd.to_datetime(df['End_Date'], errors='coerce')
 
     df = df.dropna(subset=['Date'])
     df['Date_Only'] = df['Date'].dt.date
-    today = datetime.now().date()
     
     # --- 🛠️ 3. SEARCH & FILTERS ---
     col_search, col_setup = st.columns([2, 1])
     search_query = col_search.text_input("🔍 Search Venue", placeholder="Search...").lower()
     
-    unique_setups = ["All"]
-    if not df_log_all.empty:
-        unique_setups += sorted(df_log_all['Setup_Type'].dropna().unique().tolist())
+    unique_setups = ["All"] + sorted(df['Setup_Type'].dropna().unique().tolist())
     setup_filter = col_setup.selectbox("🚚 Setup Type", unique_setups)
 
     # --- 🕒 4. RECENTLY COMPLETED ---
-    past_limit = today - timedelta(days=30)
     history_df = df[(df['Date_Only'] < today) & (df['Date_Only'] >= past_limit)].sort_values('Date', ascending=False)
     
     with st.expander("🕒 View Recently Completed (Past 30 Days)", expanded=False):
-        render_grid(history_df, df_log_all, df_fin_all, df_con_all, df_reports_all, "past", search_query, setup_filter)
+        render_grid(history_df, "past", search_query, setup_filter)
 
     st.divider()
 
     # --- 📅 5. UPCOMING SCHEDULE ---
     display_df = df[df['Date_Only'] >= today].sort_values('Date', ascending=True)
     st.subheader("📅 Upcoming Schedule")
-    render_grid(display_df, df_log_all, df_fin_all, df_con_all, df_reports_all, "up", search_query, setup_filter)
+
+    # One map layer for the week ahead instead of an iframe per card
+    week_df = display_df[display_df['Date_Only'] <= today + timedelta(days=7)]
+    with st.expander(f"🗺️ This Week's Locations ({len(week_df)})", expanded=not week_df.empty):
+        render_event_map(venue_points(week_df, get_data, db))
+
+    render_grid(display_df, "up", search_query, setup_filter)
 
 # --- 🖼️ 6. GRID RENDERER HELPER ---
-def render_grid(dataframe, df_log, df_fin, df_con, df_rep, prefix, search, setup_f):
+def render_grid(dataframe, prefix, search, setup_f):
+    """Renders event cards from the pre-joined card frame (see modules/event_cards.py)."""
     if dataframe.empty:
         st.write("No events match your criteria.")
         return
@@ -90,22 +93,18 @@ def render_grid(dataframe, df_log, df_fin, df_con, df_rep, prefix, search, setup
     if search:
         dataframe = dataframe[dataframe['Venue'].str.lower().str.contains(search)]
 
+    if setup_f != "All":
+        dataframe = dataframe[dataframe['Setup_Type'] == setup_f]
+
+    # Only the current page of cards is rendered
+    dataframe = paginate(dataframe, f"grid_{prefix}", reset_on=(search, setup_f))
+
     grid_cols = st.columns(3)
     visible_idx = 0
 
     for idx, row in dataframe.iterrows():
         eid = row['Event_ID']
         address = row.get('Address', row['Venue'])
-        
-        # Filtering logic for cross-referenced data
-        fin = df_fin[df_fin['Event_ID'] == eid].iloc[0] if not df_fin[df_fin['Event_ID'] == eid].empty else {}
-        con = df_con[(df_con['Event_ID'] == eid) & (df_con['Role'] == 'Primary Contact')].iloc[0] if not df_con[(df_con['Event_ID'] == eid) & (df_con['Role'] == 'Primary Contact')].empty else {}
-        log_match = df_log[df_log['Event_ID'] == eid]
-        rep_match = df_rep[df_rep['Event_ID'] == eid]
-
-        if setup_f != "All":
-            if log_match.empty or log_match.iloc[0]['Setup_Type'] != setup_f:
-                continue
 
         with grid_cols[visible_idx % 3]:
             with st.container(border=True):
@@ -118,25 +117,23 @@ def render_grid(dataframe, df_log, df_fin, df_con, df_rep, prefix, search, setup
                 st.write(dt_text)
 
                 c1, c2 = st.columns([2, 1])
-                c1.caption(f"👤 {con.get('Name', 'TBA')}")
-                r_stat = fin.get('Rent_Status', 'Due')
+                c1.caption(f"👤 {card_value(row, 'Primary_Contact_Name', 'TBA')}")
+                r_stat = card_value(row, 'Rent_Status', 'Due')
                 r_col = "#28a745" if r_stat == "Paid" else "#ffc107" 
                 c2.markdown(f"<p style='text-align:right; margin:0;'><span class='status-badge' style='background-color:{r_col};'>💰 {r_stat}</span></p>", unsafe_allow_html=True)
 
-                if not log_match.empty:
-                    log = log_match.iloc[0]
+                if row['Has_Logistics']:
                     st.markdown(f"""
                         <div class="logistics-box">
-                            <p style="margin:0; font-size: 0.85rem;">🚚 <b>{log.get('Setup_Type', 'TBA')}</b></p>
-                            <p style="margin:0; font-size: 0.75rem;">🔽 In: {log.get('Bump_In', '--')} | 🔼 Out: {log.get('Bump_Out', '--')}</p>
+                            <p style="margin:0; font-size: 0.85rem;">🚚 <b>{card_value(row, 'Setup_Type', 'TBA')}</b></p>
+                            <p style="margin:0; font-size: 0.75rem;">🔽 In: {card_value(row, 'Bump_In', '--')} | 🔼 Out: {card_value(row, 'Bump_Out', '--')}</p>
                         </div>
                     """, unsafe_allow_html=True)
                 else:
                     st.caption("🚚 Logistics: Pending")
 
-                if not rep_match.empty:
-                    rep = rep_match.iloc[0]
-                    st.success(f"☀️ **Recorded:** {rep.get('Weather', 'Sunny')}")
+                if row['Has_Report']:
+                    st.success(f"☀️ **Recorded:** {card_value(row, 'Weather', 'Sunny')}")
                 else:
                     search_q = f"weather+at+{str(address).replace(' ', '+')}+on+{row['Date'].strftime('%Y-%m-%d')}"
                     st.markdown(f"""
@@ -147,8 +144,6 @@ def render_grid(dataframe, df_log, df_fin, df_con, df_rep, prefix, search, setup
                         </a>        
                     """, unsafe_allow_html=True)
 
-                render_mini_map(address)
-                
                 if st.button("📈 Open Workspace", key=f"btn_{prefix}_{eid}_{idx}", use_container_width=True):
                     st.session_state.selected_event_id = eid
                     st.session_state.page = "📈 Event Workspace"
@@ -1,6 +1,5 @@
 import streamlit as st
 import pandas as pd
-from modules.auth import nuclear_clean # Import the pro cleaning tool
 
 def show_staff(get_data, conn):
     st.title("👥 Staff Management")
@@ -16,9 +15,7 @@ def show_staff(get_data, conn):
         st.warning("No staff data found.")
         return
 
-    # Clean the data using our shared module
-    staff_df['Email'] = staff_df['Email'].astype(str).str.lower().str.strip()
-    staff_df['PIN'] = staff_df['PIN'].apply(nuclear_clean)
+    # Emails, phones and PINs are already normalized at load time (see modules/normalize.py)
 
     st.subheader("Current Team")
     st.dataframe(staff_df, use_container_width=True, hide_index=True)
@@ -3,147 +3,164 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from modules.ui_utils import render_mini_map
-
-def render_overview_tab(eid, event_core, df_events, db, get_data, is_adm):
-    # --- 1. CASE-SAFE DATA EXTRACTION ---
-    def get_val(key_list, default=""):
-        for k in key_list:
-            val = event_core.get(k)
-            if val is not None and not (isinstance(val, float) and np.isnan(val)):
-                return val
-        return default
-
-    curr_venue = get_val(['venue', 'Venue'], "Unknown Venue")
-    curr_org = get_val(['organiser_name', 'Organiser_Name', 'Organiser'], "")
-    curr_addr = get_val(['address', 'Address'], "")
-    curr_notes = get_val(['notes', 'Notes'], "")
-    curr_multi = str(get_val(['is_multi_day', 'Is_Multi_Day'], "No")).strip().lower() == "yes"
-
-    # --- 2. ROBUST DATE PARSING ---
-    # We use errors='coerce' and then fillna to ensure we always have a valid date object
-    try:
-        raw_start = get_val(['date', 'Date'])
-        raw_end = get_val(['end_date', 'End_Date'])
+from modules.event_bundle import load_event_bundle
+
+def render_overview_tab(eid, db, is_adm):
+    """
+    Overview panel. Runs as a fragment: toggling Edit Mode, adding a contact
+    or saving reruns only this panel instead of the whole app.
+    """
+    @st.fragment
+    def overview_panel():
+        # Re-read through the cache on every fragment rerun so saves show up here
+        bundle = load_event_bundle(eid, db)
+        event_core = bundle.event
+        if event_core is None:
+            st.error(f"Event ID {eid} not found.")
+            return
+
+        # --- 1. CASE-SAFE DATA EXTRACTION ---
+        def get_val(key_list, default=""):
+            for k in key_list:
+                val = event_core.get(k)
+                if val is not None and not (isinstance(val, float) and np.isnan(val)):
+                    return val
+            return default
+
+        curr_venue = get_val(['venue', 'Venue'], "Unknown Venue")
+        curr_org = get_val(['organiser_name', 'Organiser_Name', 'Organiser'], "")
+        curr_addr = get_val(['address', 'Address'], "")
+        curr_notes = get_val(['notes', 'Notes'], "")
+        curr_multi = str(get_val(['is_multi_day', 'Is_Multi_Day'], "No")).strip().lower() == "yes"
+
+        # --- 2. ROBUST DATE PARSING ---
+        # We use errors='coerce' and then fillna to ensure we always have a valid date object
+        try:
+            raw_start = get_val(['date', 'Date'])
+            raw_end = get_val(['end_date', 'End_Date'])
         
-        # Try parsing ISO format first (YYYY-MM-DD) as it's most reliable from DBs
-        start_dt = pd.to_datetime(raw_start, errors='coerce').date()
-        end_dt = pd.to_datetime(raw_end, errors='coerce').date()
-
-        # If parsing failed (result is NaT/None), fallback to current date
-        if pd.isna(start_dt):
-            from datetime import datetime
-            start_dt = datetime.now().date()
+            # Try parsing ISO format first (YYYY-MM-DD) as it's most reliable from DBs
+            start_dt = pd.to_datetime(raw_start, errors='coerce').date()
+            end_dt = pd.to_datetime(raw_end, errors='coerce').date()
+
+            # If parsing failed (result is NaT/None), fallback to current date
+            if pd.isna(start_dt):
+                from datetime import datetime
+                start_dt = datetime.now().date()
         
-        if pd.isna(end_dt):
-            end_dt = start_dt
+            if pd.isna(end_dt):
+                end_dt = start_dt
             
-    except Exception as e:
-        from datetime import datetime
-        start_dt = end_dt = datetime.now().date()
-
-    # --- 3. HEADER & CONTROL ROW ---
-    col_h, col_edit = st.columns([3, 1])
-    with col_h:
-        st.subheader(f"📍 {curr_venue} Dashboard")
-    with col_edit:
-        edit_mode = st.toggle("🔓 Edit Mode", value=False) if is_adm else False
-
-    # --- 4. THE DASHBOARD LAYOUT ---
-    col_form, col_map = st.columns([1.6, 1.4], gap="medium")
-
-    with col_form:
-        with st.container(border=True):
-            # Checkbox lives outside the form so it can toggle the 'End Date' state instantly
-            is_multi = st.checkbox("Multi-Day Event", value=curr_multi, disabled=not edit_mode)
-            if not edit_mode:
-                st.caption("📅 Multi-Day Event" if is_multi else "⏱️ Single Day Event")
-
-            with st.form("overview_form_master", border=False):
-                d1, d2 = st.columns(2)
-                # Streamlit date_input returns a datetime.date object
-                new_start = d1.date_input("Start Date", value=start_dt, disabled=not edit_mode)
+        except Exception as e:
+            from datetime import datetime
+            start_dt = end_dt = datetime.now().date()
+
+        # --- 3. HEADER & CONTROL ROW ---
+        col_h, col_edit = st.columns([3, 1])
+        with col_h:
+            st.subheader(f"📍 {curr_venue} Dashboard")
+        with col_edit:
+            edit_mode = st.toggle("🔓 Edit Mode", value=False) if is_adm else False
+
+        # --- 4. THE DASHBOARD LAYOUT ---
+        col_form, col_map = st.columns([1.6, 1.4], gap="medium")
+
+        with col_form:
+            with st.container(border=True):
+                # Checkbox lives outside the form so it can toggle the 'End Date' state instantly
+                is_multi = st.checkbox("Multi-Day Event", value=curr_multi, disabled=not edit_mode)
+                if not edit_mode:
+                    st.caption("📅 Multi-Day Event" if is_multi else "⏱️ Single Day Event")
+
+                with st.form("overview_form_master", border=False):
+                    d1, d2 = st.columns(2)
+                    # Streamlit date_input returns a datetime.date object
+                    new_start = d1.date_input("Start Date", value=start_dt, disabled=not edit_mode)
                 
-                # Logic: If not multi-day, end date is forced to match start date
-                default_end = end_dt if is_multi else new_start
-                new_end = d2.date_input("End Date", value=default_end, disabled=not (edit_mode and is_multi))
+                    # Logic: If not multi-day, end date is forced to match start date
+                    default_end = end_dt if is_multi else new_start
+                    new_end = d2.date_input("End Date", value=default_end, disabled=not (edit_mode and is_multi))
 
-                v1, v2 = st.columns(2)
-                new_venue = v1.text_input("Venue Name", value=str(curr_venue), disabled=not edit_mode)
-                new_org = v2.text_input("Organiser", value=str(curr_org), disabled=not edit_mode)
+                    v1, v2 = st.columns(2)
+                    new_venue = v1.text_input("Venue Name", value=str(curr_venue), disabled=not edit_mode)
+                    new_org = v2.text_input("Organiser", value=str(curr_org), disabled=not edit_mode)
 
-                new_address = st.text_area("Address", value=str(curr_addr), disabled=not edit_mode, height=100)
-                new_notes = st.text_area("Internal Notes", value=str(curr_notes), disabled=not edit_mode, height=115)
+                    new_address = st.text_area("Address", value=str(curr_addr), disabled=not edit_mode, height=100)
+                    new_notes = st.text_area("Internal Notes", value=str(curr_notes), disabled=not edit_mode, height=115)
 
-                if st.form_submit_button("💾 Save Changes", use_container_width=True, disabled=not edit_mode):
-                    if not new_venue or new_venue == "Unknown Venue":
-                        st.error("Please enter a valid Venue Name before saving.")
-                    else:
-                        with st.spinner("Updating Database..."):
-                            # We explicitly format to YYYY-MM-DD for Supabase/Postgres
-                            updated_row = {
-                                "event_id": str(eid),
-                                "venue": new_venue, 
-                                "date": new_start.isoformat(), 
-                                "end_date": new_end.isoformat() if is_multi else new_start.isoformat(), 
-                                "is_multi_day": "Yes" if is_multi else "No", 
-                                "address": new_address, 
-                                "organiser_name": new_org, 
-                                "notes": new_notes
-                            }
+                    if st.form_submit_button("💾 Save Changes", use_container_width=True, disabled=not edit_mode):
+                        if not new_venue or new_venue == "Unknown Venue":
+                            st.error("Please enter a valid Venue Name before saving.")
+                        else:
+                            with st.spinner("Updating Database..."):
+                                # We explicitly format to YYYY-MM-DD for Supabase/Postgres
+                                updated_row = {
+                                    "event_id": str(eid),
+                                    "venue": new_venue, 
+                                    "date": new_start.isoformat(), 
+                                    "end_date": new_end.isoformat() if is_multi else new_start.isoformat(), 
+                                    "is_multi_day": "Yes" if is_multi else "No", 
+                                    "address": new_address, 
+                                    "organiser_name": new_org, 
+                                    "notes": new_notes
+                                }
                             
-                            try:
-                                db.client.table("events").upsert(updated_row, on_conflict="event_id").execute()
-                                st.cache_data.clear()
-                                st.success("Database Updated Successfully!")
-                                st.rerun()
-                            except Exception as e:
-                                st.error(f"❌ Update Failed: {str(e)}")
-
-    with col_map:
-        with st.container(border=True):
-            st.caption("🗺️ Interactive Site Map")
-            if not curr_addr or str(curr_addr).lower() == "nan":
-                st.info("📍 Enter an address in Edit Mode to display the map.")
-            else:
-                try:
-                    render_mini_map(str(curr_addr).strip())
-                except Exception as e:
-                    st.error("Map could not be loaded.")
+                                # Keyed save - only invalidates the cached Events table
+                                if db.upsert_row("Events", updated_row):
+                                    st.success("Database Updated Successfully!")
+                                    # Venue / dates also drive the workspace header and day selector
+                                    header_changed = (
+                                        new_venue != str(curr_venue) or new_start != start_dt
+                                        or new_end != end_dt or is_multi != curr_multi
+                                    )
+                                    st.rerun(scope="app" if header_changed else "fragment")
+
+        with col_map:
+            with st.container(border=True):
+                st.caption("🗺️ Interactive Site Map")
+                if not curr_addr or str(curr_addr).lower() == "nan":
+                    st.info("📍 Enter an address in Edit Mode to display the map.")
+                else:
+                    try:
+                        render_mini_map(str(curr_addr).strip())
+                    except Exception as e:
+                        st.error("Map could not be loaded.")
             
-            st.markdown("<div style='margin-top: 25px;'></div>", unsafe_allow_html=True)
+                st.markdown("<div style='margin-top: 25px;'></div>", unsafe_allow_html=True)
             
-            # --- CONTACTS SECTION ---
-            with st.popover("👥 Manage Event Contacts", use_container_width=True):
-                # (Contacts logic remains same as 1.3)
-                with st.form("quick_add_contact"):
-                    st.write("**Add New Contact**")
-                    c_name = st.text_input("Name")
-                    c_role = st.selectbox("Role", ["Manager", "Organizer", "Staff", "Other"])
-                    if st.form_submit_button("Save Contact", use_container_width=True):
-                        if c_name:
-                            new_c = {"event_id": str(eid), "name": c_name, "role": c_role}
-                            db.client.table("event_contacts").insert(new_c).execute()
-                            st.cache_data.clear()
-                            st.rerun()
+                # --- CONTACTS SECTION ---
+                with st.popover("👥 Manage Event Contacts", use_container_width=True):
+                    # (Contacts logic remains same as 1.3)
+                    with st.form("quick_add_contact"):
+                        st.write("**Add New Contact**")
+                        c_name = st.text_input("Name")
+                        c_role = st.selectbox("Role", ["Manager", "Organizer", "Staff", "Other"])
+                        if st.form_submit_button("Save Contact", use_container_width=True):
+                            if c_name:
+                                new_c = {"event_id": str(eid), "name": c_name, "role": c_role}
+                                if db.insert_row("Event_Contacts", new_c):
+                                    st.rerun(scope="fragment")
                 
-                st.divider()
-                df_con = get_data("event_contacts")
-                if not df_con.empty:
-                    actual_cols = df_con.columns.tolist()
-                    id_col = next((c for c in actual_cols if c.lower() == 'event_id'), None)
-                    if id_col:
-                        current_contacts = df_con[df_con[id_col].astype(str).str.strip() == str(eid).strip()]
-                        if not current_contacts.empty:
-                            for _, row in current_contacts.iterrows():
-                                role = row.get('role') or row.get('Role') or 'Staff'
-                                name = row.get('name') or row.get('Name') or 'Unknown'
-                                st.caption(f"**{role}**: {name}")
+                    st.divider()
+                    df_con = bundle.contacts
+                    if not df_con.empty:
+                        actual_cols = df_con.columns.tolist()
+                        id_col = next((c for c in actual_cols if c.lower() == 'event_id'), None)
+                        if id_col:
+                            current_contacts = df_con[df_con[id_col].astype(str).str.strip() == str(eid).strip()]
+                            if not current_contacts.empty:
+                                for _, row in current_contacts.iterrows():
+                                    role = row.get('role') or row.get('Role') or 'Staff'
+                                    name = row.get('name') or row.get('Name') or 'Unknown'
+                                    st.caption(f"**{role}**: {name}")
+                            else:
+                                st.caption("No contacts listed.")
                         else:
-                            st.caption("No contacts listed.")
+                            st.warning("ID Column missing in contacts.")
                     else:
-                        st.warning("ID Column missing in contacts.")
-                else:
-                    st.caption("No contacts found.")
+                        st.caption("No contacts found.")
+
+    overview_panel()
 
 ### end new code 1.5 ###
 
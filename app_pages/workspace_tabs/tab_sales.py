@@ -2,40 +2,20 @@ import streamlit as st
 import pandas as pd
 import time
 
-def render_sales_tab(eid, selected_report_date, db, get_data):
+def _total_row(db, view, filters):
+    """The single aggregate row of a sales view matching filters, or None."""
+    df = db.get_tables([view], filters=filters)[view]
+    return None if df.empty else df.iloc[0]
+
+def _total(row):
+    return 0.0 if row is None or pd.isna(row.get('Total_Revenue')) else float(row['Total_Revenue'])
+
+def render_sales_tab(eid, selected_report_date, db, bundle):
     """
     Modular Sales Tab for Event Workspace.
-    Uses @st.fragment for snappy balancing calculations.
+    Uses @st.fragment for snappy balancing calculations; the day/event totals
+    sit in the same fragment, so a save only refreshes this panel.
     """
-    # 1. FETCH DATA
-    @st.cache_data(ttl=600)
-    def get_sales_data():
-        return db.read_table("event_sales")
-
-    df_master_events = get_data("Events") 
-    df_sales_dest = get_sales_data()
-
-    # Force column lowercase for reliability with SQL
-    if not df_sales_dest.empty:
-        df_sales_dest.columns = [str(c).lower().strip() for c in df_sales_dest.columns]
-    else:
-        df_sales_dest = pd.DataFrame(columns=['event_id', 'total_revenue', 'card_sales', 'cash_sales'])
-
-    # Get Event Context
-    event_info = df_master_events[df_master_events['Event_ID'].astype(str) == str(eid)]
-    is_multi = str(event_info.iloc[0].get('Is_Multi_Day', 'No')) == "Yes" if not event_info.empty else False
-    
-    # --- METRICS ---
-    # Current Day Total
-    day_total = df_sales_dest[df_sales_dest['event_id'].astype(str) == str(eid)]['total_revenue'].sum()
-    
-    m_col1, m_col2 = st.columns(2)
-    m_col1.metric("Today's Gross", f"${day_total:,.2f}")
-    if is_multi:
-        m_col2.metric("Event Total (to date)", f"${day_total:,.2f}")
-    
-    st.divider()
-
     # --- FORM STATE ---
     # We use session state to track the "Auto-fill" and form resets
     if "form_id" not in st.session_state: st.session_state.form_id = 0
@@ -44,6 +24,30 @@ def render_sales_tab(eid, selected_report_date, db, get_data):
     # --- THE FRAGMENT ---
     @st.fragment
     def render_sales_form():
+        # --- TOTALS ---
+        # Only the totals shown below - summed in the database (sql/sales_ledger.sql)
+        event_info = bundle.event
+        is_multi = str(event_info.get('Is_Multi_Day', 'No')) == "Yes" if event_info is not None else False
+        venue = event_info.get('Venue') if event_info is not None else None
+
+        day_row = _total_row(db, "Sales_Daily", {"Event_ID": str(eid), "Sale_Date": selected_report_date.isoformat()})
+        day_total = _total(day_row)
+
+        # --- METRICS ---
+        m_col1, m_col2, m_col3 = st.columns(3)
+        m_col1.metric(f"{selected_report_date.strftime('%a %d %b')} Gross", f"${day_total:,.2f}")
+        if is_multi:
+            event_total = _total(_total_row(db, "Sales_By_Event", {"Event_ID": str(eid)}))
+            m_col2.metric("Event Total (to date)", f"${event_total:,.2f}")
+        if venue:
+            venue_total = _total(_total_row(db, "Sales_By_Venue", {"Venue": venue}))
+            m_col3.metric("Venue Total (all events)", f"${venue_total:,.2f}")
+
+        if day_row is not None:
+            st.caption("ℹ️ Sales are already recorded for this day - saving again replaces that record.")
+    
+        st.divider()
+
         st.subheader(f"📝 Sales Entry: {selected_report_date.strftime('%d/%m/%Y')}")
         fid = st.session_state.form_id
         
@@ -88,22 +92,28 @@ def render_sales_tab(eid, selected_report_date, db, get_data):
             if st.button("💾 Save Sales Record", use_container_width=True, type="primary"):
                 new_row = {
                     "event_id": str(eid),
+                    "sale_date": selected_report_date.isoformat(),
                     "card_sales": float(v_card),
                     "cash_sales": float(v_cash),
+                    "quick_sales": float(v_quick),
+                    "food_sales": float(v_food),
+                    "drinks_sales": float(v_drinks),
+                    "uncategorised_sales": float(v_uncat),
                     "total_revenue": float(t_gross),
                     "opening_float": 0.0,
                     "closing_float": 0.0
                 }
                 
                 try:
-                    if db.insert_row("event_sales", new_row):
+                    # One ledger row per (event_id, sale_date)
+                    if db.upsert_row("Event_Sales", new_row):
                         # Increment form_id to clear all number_inputs
                         st.session_state.form_id += 1
                         st.session_state.fill_val = 0.0
-                        st.cache_data.clear() 
                         st.success("✅ Saved!")
                         time.sleep(1)
-                        st.rerun() 
+                        # Totals live in this fragment too - no full-app rerun needed
+                        st.rerun(scope="fragment")
                 except Exception as e:
                     st.error(f"Error saving sales: {e}")
 
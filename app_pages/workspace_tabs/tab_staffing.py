@@ -1,53 +1,97 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+from modules.event_bundle import load_event_bundle
+from modules.normalize import time_minutes
+from modules.roster import event_days, load_roster_index
+from modules.ui_utils import paginate
+
+# Gallery page sizes (multiples of the 2-column layout)
+STAFF_PAGE_SIZES = [8, 16, 32]
+
+def _skill_options(df_staff_db):
+    """Distinct skills across the roster ("RSA, Forklift" -> RSA, Forklift)."""
+    if 'Skills' not in df_staff_db.columns:
+        return []
+    skills = df_staff_db['Skills'].dropna().astype(str).str.split(r'[,;/]').explode().str.strip()
+    skills = skills[skills != ""]
+    return sorted(skills[~skills.str.lower().duplicated()].tolist(), key=str.lower)
 
 def render_staffing_tab(eid, db, get_data, is_adm):
     """
     Modular Staffing Tab for Event Workspace.
-    Features: Staff Gallery, Role-based assignment, and Shift validation.
+    Features: searchable/filterable Staff Gallery (one page at a time), one
+    shared assignment form, and Shift validation (length, plus clashes
+    with the person's shifts at other events - see modules/roster.py).
+    Runs as a fragment: assigning or removing staff reruns only this panel.
     """
-    st.subheader("📋 Available Staff Gallery")
+    sel_key = f"staff_selected_{eid}"
+
+    @st.fragment
+    def staffing_panel():
+        st.subheader("📋 Available Staff Gallery")
 
-    # 1. FETCH DATA
-    df_staff_db = get_data("Staff_Database")
-    df_staffing = get_data("Event_Staffing")
+        # 1. FETCH DATA
+        df_staff_db = get_data("Staff_Database", columns=["Staff_Name", "Phone", "Rating", "Skills"])
+        bundle = load_event_bundle(eid, db)  # Only this event's rows, re-read on fragment reruns
+        df_staffing = bundle.staffing
+        roster = load_roster_index(get_data, db)  # Every shift this season, indexed by (staff, day)
+        days = event_days(bundle.event)
     
-    # Initialize empty state if table is new
-    if df_staffing.empty or 'Event_ID' not in df_staffing.columns:
-        df_staffing = pd.DataFrame(columns=['Event_ID', 'Staff_Name', 'Start_Time', 'End_Time', 'Payment_Status', 'Type'])
+        # Initialize empty state if table is new
+        if df_staffing.empty or 'Event_ID' not in df_staffing.columns:
+            df_staffing = pd.DataFrame(columns=['Event_ID', 'Staff_Name', 'Start_Time', 'End_Time', 'Payment_Status', 'Type'])
+
+        # Staff already assigned to this specific event (set lookups)
+        assigned_names = set(df_staffing.loc[df_staffing['Event_ID'].astype(str) == str(eid), 'Staff_Name'])
+
+        if df_staff_db.empty:
+            st.warning("No staff records found in Staff_Database.")
+            return
 
-    # Get list of staff already assigned to this specific event
-    assigned_names = df_staffing[df_staffing['Event_ID'].astype(str) == str(eid)]['Staff_Name'].tolist()
+        df_staff_db = df_staff_db.assign(Assigned=df_staff_db['Staff_Name'].isin(assigned_names))
+        busy_elsewhere = roster.busy_staff(days, exclude_event=str(eid))
 
-    if not df_staff_db.empty:
-        # 2. STAFF GALLERY GRID
+        # 2. SEARCH & FILTERS
+        f1, f2, f3, f4 = st.columns([2, 2, 1, 1])
+        search = f1.text_input("🔍 Search Staff", placeholder="Name or skill...", key=f"staff_search_{eid}").strip().lower()
+        skills_f = f2.multiselect("🛠️ Skills", _skill_options(df_staff_db), key=f"staff_skills_{eid}")
+        min_rating = f3.selectbox("⭐ Min Rating", [0, 1, 2, 3, 4, 5], format_func=lambda r: "Any" if r == 0 else f"{r}+", key=f"staff_rating_{eid}")
+        show_f = f4.selectbox("👥 Show", ["All", "Assigned", "Idle"], key=f"staff_show_{eid}")
+
+        view = df_staff_db
+        if search:
+            haystack = view['Staff_Name'].astype(str).str.lower() + " " + view['Skills'].fillna("").astype(str).str.lower()
+            view = view[haystack.str.contains(search, regex=False)]
+        for skill in skills_f:
+            view = view[view['Skills'].fillna("").astype(str).str.contains(skill, case=False, regex=False)]
+        if min_rating:
+            view = view[view['Rating'].fillna(0) >= min_rating]
+        if show_f != "All":
+            view = view[view['Assigned'] == (show_f == "Assigned")]
+
+        st.caption(f"{len(view)} of {len(df_staff_db)} staff")
+
+        # 3. STAFF GALLERY GRID (current page only)
+        view = paginate(view, f"staff_{eid}", reset_on=(search, tuple(skills_f), min_rating, show_f), page_sizes=STAFF_PAGE_SIZES)
         card_grid = st.columns(2)
         
-        for i, (idx, s_row) in enumerate(df_staff_db.iterrows()):
-            name = s_row['Staff_Name']
-            
-            # --- 📞 PHONE CLEANING ---
-            raw_phone = str(s_row.get('Phone', ''))
-            clean_phone = raw_phone.split('.')[0].strip()
-            # Re-add leading zero for Australian Mobile logic
-            if len(clean_phone) == 9 and clean_phone.startswith('4'):
-                clean_phone = "0" + clean_phone
-            if clean_phone.lower() == "nan" or not clean_phone:
-                clean_phone = None
+        for i, s_row in enumerate(view.itertuples(index=False)):
+            name = s_row.Staff_Name
+
+            # --- 📞 PHONE ---
+            # Cleaned (incl. the AU mobile leading 0) at load time - see modules/normalize.py
+            clean_phone = s_row.Phone
 
             # --- ⭐ STAR RATING LOGIC ---
-            try:
-                num_stars = int(float(s_row.get('Rating', 0)))
-            except (ValueError, TypeError):
-                num_stars = 0
+            # Rating is numeric already (NaN when blank)
+            num_stars = int(s_row.Rating) if pd.notna(s_row.Rating) else 0
             star_display = "⭐" * num_stars if num_stars > 0 else "No Rating"
 
             with card_grid[i % 2]:
                 with st.container(border=True):
                     h1, h2 = st.columns([3, 1])
                     h1.markdown(f"**{name}**")
-                    h2.markdown("🟢 **Active**" if name in assigned_names else "⚪ **Idle**")
+                    h2.markdown("🟢 **Active**" if s_row.Assigned else "⚪ **Idle**")
                     
                     if clean_phone:
                         st.markdown(f"📞 [ {clean_phone} ](tel:{clean_phone})")
@@ -55,74 +99,78 @@ def render_staffing_tab(eid, db, get_data, is_adm):
                         st.caption("📞 Phone: N/A")
 
                     st.caption(f"Rating: {star_display}")
-                    st.write(f"🛠️ **Skills:** {s_row.get('Skills', 'N/A')}")
+                    if not s_row.Assigned and name in busy_elsewhere:
+                        st.caption("🗓️ Rostered at another event on these dates")
+                    st.write(f"🛠️ **Skills:** {s_row.Skills if pd.notna(s_row.Skills) else 'N/A'}")
                     
                     # --- ACTION BUTTONS ---
-                    if name in assigned_names:
+                    if s_row.Assigned:
                         if is_adm:
-                            # Use unique key to avoid Streamlit Duplicate Widget ID error
-                            if st.button(f"❌ Remove {name.split()[0]}", key=f"rem_{idx}_{eid}", use_container_width=True):
-                                # Filter out the row and update table
-                                df_staffing_updated = df_staffing[~((df_staffing['Event_ID'].astype(str) == str(eid)) & 
-                                                                   (df_staffing['Staff_Name'] == name))]
-                                if db.update_table("Event_Staffing", df_staffing_updated):
-                                    st.cache_data.clear()
-                                    st.rerun()
-                    else:
-                        with st.expander("➕ Assign to Event"):
-                            with st.form(key=f"assign_f_{idx}_{eid}"):
-                                c1, c2 = st.columns(2)
-                                st_time_str = c1.text_input("Start", value="08:00")
-                                en_time_str = c2.text_input("End", value="18:00")
-
-                                # Shift duration warning
-                                try:
-                                    fmt = '%H:%M'
-                                    t1 = datetime.strptime(st_time_str, fmt)
-                                    t2 = datetime.strptime(en_time_str, fmt)
-                                    delta = (t2 - t1).total_seconds() / 3600
-                                    if delta < 0: delta += 24 
-                                    if delta > 8:
-                                        st.warning(f"⚠️ Long Shift: {delta:.1f} hrs")
-                                except:
-                                    pass
-
-                                if st.form_submit_button("Confirm Assignment", use_container_width=True):
-                                    new_entry = {
-                                        "Event_ID": eid, "Staff_Name": name, 
-                                        "Start_Time": st_time_str, "End_Time": en_time_str, 
-                                        "Payment_Status": "Pending", "Type": "Standard"
-                                    }
-                                    if db.insert_row("Event_Staffing", new_entry):
-                                        st.cache_data.clear()
-                                        st.success(f"{name} added!")
-                                        st.rerun()
-    else:
-        st.warning("No staff records found in Staff_Database.")
-
-    st.divider()
-
-    # 3. ADMIN QUICK ADD (SEARCHABLE)
+                            if st.button(f"❌ Remove {name.split()[0]}", key=f"rem_{eid}_{name}", use_container_width=True):
+                                # Delete only this assignment row
+                                if db.delete_rows("Event_Staffing", {"Event_ID": eid, "Staff_Name": name}):
+                                    st.rerun(scope="fragment")
+                    elif st.button("➕ Select for Shift", key=f"sel_{eid}_{name}", use_container_width=True):
+                        st.session_state[sel_key] = name
+
+        st.divider()
+
+        # 4. SHARED ASSIGNMENT FORM (one form, whoever is selected)
+        idle_names = df_staff_db.loc[~df_staff_db['Assigned'], 'Staff_Name'].tolist()
+        if not idle_names:
+            st.caption("✅ Everyone on the roster is assigned to this event.")
+            return
+
+        selected = st.session_state.get(sel_key)
+        with st.form(f"assign_staff_{eid}", clear_on_submit=True, border=True):
+            st.markdown("**➕ Assign to Event**")
+            sel_staff = st.selectbox(
+                "Staff Member", idle_names,
+                index=idle_names.index(selected) if selected in idle_names else 0,
+            )
+            col1, col2 = st.columns(2)
+            s_time = col1.text_input("Start Time", value="08:00")
+            e_time = col2.text_input("End Time", value="18:00")
+
+            if st.form_submit_button("Confirm Assignment", use_container_width=True, type="primary"):
+                start_min, end_min = time_minutes(pd.Series([s_time, e_time]))
+                if pd.isna(start_min) or pd.isna(end_min):
+                    st.error("Enter shift times as HH:MM (e.g. 08:00).")
+                    return
+
+                # Clashes with this person's shifts at other events, on any day of this one
+                clashes = [
+                    shift for day in days
+                    for shift in roster.conflicts(sel_staff, day, int(start_min), int(end_min), exclude_event=str(eid))
+                ]
+                if clashes:
+                    st.error(f"⛔ {sel_staff} is already rostered at an overlapping shift:\n\n" + "\n".join(
+                        f"- **{c.event_id}** on {c.day:%a %d %b}, {c.label}" for c in dict.fromkeys(clashes)
+                    ))
+                    return
+
+                # Shift duration warning (a toast survives the rerun below)
+                hours = ((end_min - start_min) % (24 * 60)) / 60
+                if hours > 8:
+                    st.toast(f"⚠️ Long Shift: {hours:.1f} hrs")
+
+                new_entry = {
+                    "Event_ID": eid, "Staff_Name": sel_staff,
+                    "Start_Time": s_time, "End_Time": e_time,
+                    "Payment_Status": "Pending", "Type": "Standard"
+                }
+                if db.insert_row("Event_Staffing", new_entry):
+                    st.session_state.pop(sel_key, None)
+                    st.success(f"{sel_staff} added!")
+                    st.rerun(scope="fragment")
+
+    staffing_panel()
+
+    # --- ⚠️ SEASON ROSTER CHECK ---
     if is_adm:
-        with st.expander("🔍 Search & Assign Staff"):
-            with st.form("add_staff_form_quick", clear_on_submit=True):
-                staff_options = df_staff_db['Staff_Name'].tolist() if not df_staff_db.empty else []
-                sel_staff = st.selectbox("Select Staff Member", staff_options)
-                
-                col1, col2 = st.columns(2)
-                s_time = col1.text_input("Start Time", value="08:00")
-                e_time = col2.text_input("End Time", value="18:00")
-                
-                if st.form_submit_button("Assign to Event", use_container_width=True):
-                    if sel_staff:
-                        new_quick = {
-                            "Event_ID": eid, "Staff_Name": sel_staff,
-                            "Start_Time": s_time, "End_Time": e_time,
-                            "Payment_Status": "Pending", "Type": "Standard"
-                        }
-                        if db.insert_row("Event_Staffing", new_quick):
-                            st.cache_data.clear()
-                            st.success(f"Added {sel_staff}!")
-                            st.rerun()
-    else:
-        st.caption("🔒 Roster management is restricted to Admins.")
\ No newline at end of file
+        with st.expander("⚠️ Roster clashes this season"):
+            clashes = load_roster_index(get_data, db).validate()
+            if clashes.empty:
+                st.success("No overlapping shifts on the roster.")
+            else:
+                st.dataframe(clashes, hide_index=True, use_container_width=True)
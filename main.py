@@ -12,18 +12,27 @@ if root_path not in sys.path:
     sys.path.append(root_path)
 
 # --- 2. CUSTOM MODULE IMPORTS ---
-from modules.auth import send_admin_code, nuclear_clean
-from modules.drive_utils import upload_to_drive
+import importlib
 from modules.supabase_db import db  # Importing the initialized 'db' object
 
-# --- 3. PAGE IMPORTS ---
-from app_pages.home import show_home
-from app_pages.create_event import show_create_event
-from app_pages.staff import show_staff
-from app_pages.logs import show_logs
-from app_pages.all_events import show_all_events
-from app_pages.event_workspace import show_event_workspace
-from app_pages.create_staff import show_create_staff
+# --- 3. PAGE REGISTRY ---
+# route -> (module, function). A page module (and whatever it imports) is
+# loaded the first time its route is opened, so the login screen only pays
+# for Streamlit + Supabase.
+PAGES = {
+    "🏠 Event Hub": ("app_pages.home", "show_home"),
+    "➕ Create Event": ("app_pages.create_event", "show_create_event"),
+    "➕ Create Staff": ("app_pages.create_staff", "show_create_staff"),
+    "👥 Staff": ("app_pages.staff", "show_staff"),
+    "🗂️ All Events Archive": ("app_pages.all_events", "show_all_events"),
+    "📦 Inventory": ("app_pages.logs", "show_logs"),
+    "📈 Event Workspace": ("app_pages.event_workspace", "show_event_workspace"),
+}
+
+def load_page(page):
+    """Import a route's module on first use (cached in sys.modules after that)."""
+    module_name, func_name = PAGES[page]
+    return getattr(importlib.import_module(module_name), func_name)
 
 # --- CONFIG ---
 st.set_page_config(page_title="Twisted Potato Hub", layout="wide", page_icon="🚚")
@@ -50,23 +59,32 @@ if "user_email" not in st.session_state:
     st.session_state.user_email = ""
 
 # --- GLOBAL DATA HELPER ---
-@st.cache_data(ttl=60)
-def get_data(sheet_name):
-    """Bridge function to keep existing page logic working with Supabase"""
-    return db.read_table(sheet_name)
+def get_data(*sheet_names, **query):
+    """
+    Bridge function to keep existing page logic working with Supabase.
+
+    get_data("Events") returns one DataFrame; get_data("Events", "Event_Reports", ...)
+    fetches all tables in parallel and returns a list in the same order.
+    Query keywords (columns, filters, date_range, order - see db.read_table)
+    are pushed down to Supabase and are part of the cache key.
+
+    Reads are cached per table in db.cache; a save through db only
+    invalidates the table it wrote to.
+    """
+    frames = db.get_tables(sheet_names, **query)
+    if len(sheet_names) == 1:
+        return frames[sheet_names[0]]
+    return [frames[name] for name in sheet_names]
 
 # ==========================================
 # 🔐 AUTHENTICATION LAYER
 # ==========================================
 if not st.session_state.authenticated:
+    from modules.auth import load_login_index, check_pin, send_admin_code
+
     st.title("🔐 Staff Login")
-    staff_df = get_data("Staff")
-    
-    if not staff_df.empty:
-        staff_df['Email'] = staff_df['Email'].astype(str).str.lower().str.strip()
-        # Ensure PINs are cleaned for comparison
-        if 'PIN' in staff_df.columns:
-            staff_df['PIN'] = staff_df['PIN'].apply(nuclear_clean)
+    # email -> (hashed PIN, role), built once per Staff table version
+    login_index = load_login_index(get_data, db)
 
     with st.container(border=True):
         email_in = st.text_input("Staff Email", key="auth_email_input").lower().strip()
@@ -83,13 +101,12 @@ if not st.session_state.authenticated:
                 del st.session_state.recovery_code 
                 st.rerun()
             else:
-                user_match = staff_df[staff_df['Email'] == email_in]
-                if not user_match.empty:
-                    stored_pin = str(user_match.iloc[0]['PIN'])
-                    if clean_input == stored_pin and clean_input != "":
+                user_entry = login_index.get(email_in)
+                if user_entry is not None:
+                    if check_pin(user_entry, clean_input):
                         st.session_state.authenticated = True
                         st.session_state.user_email = email_in
-                        st.session_state.user_role = str(user_match.iloc[0].get('Role', 'Staff'))
+                        st.session_state.user_role = user_entry[1]
                         st.rerun()
                     else:
                         st.error("❌ Invalid PIN.")
@@ -154,20 +171,12 @@ else:
     # --- THE ROUTER ---
     page = st.session_state.page
     
-    if page == "🏠 Event Hub":
-        show_home(get_data, db)
-    elif page == "➕ Create Event":
-        show_create_event(get_data, db)
-    elif page == "➕ Create Staff":
-        show_create_staff(get_data, db)
-    elif page == "👥 Staff":
-        show_staff(get_data, db)
-    elif page == "🗂️ All Events Archive": 
-        show_all_events(get_data)
-    elif page == "📦 Inventory":
-        show_logs(get_data, db)
-    elif page == "📈 Event Workspace":    
-        show_event_workspace(st.session_state.selected_event_id, get_data, db)
+    if page in PAGES:
+        show_page = load_page(page)
+        if page == "📈 Event Workspace":
+            show_page(st.session_state.selected_event_id, get_data, db)
+        else:
+            show_page(get_data, db)
 # import streamlit as st
 # # from streamlit_gsheets import GSheetsConnection
 # from modules.supabase_db import get_supabase
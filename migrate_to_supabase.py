@@ -1,11 +1,13 @@
 #### new script 5 ####
 import streamlit as st
-from streamlit_gsheets import GSheetsConnection
 from modules.supabase_db import get_supabase
 import pandas as pd
 import numpy as np
 
 def migrate_ui():
+    # GSheets connection is only needed while migrating
+    from streamlit_gsheets import GSheetsConnection
+
     st.title("🎯 Final Table Migration: Event_Sales")
     
     if st.button("Finalize Event_Sales Migration"):
@@ -1,10 +1,19 @@
 import streamlit as st
 import re
-import smtplib
 import random
-from email.mime.text import MIMEText
+import hashlib
+import hmac
+import secrets
+
+from modules import normalize
+
+# Per-process key for the in-memory PIN hashes (never stored or sent anywhere)
+_PIN_KEY = secrets.token_bytes(32)
 
 def send_admin_code(target_email, code):
+    # SMTP client is only imported when a code is actually sent
+    import smtplib
+    from email.mime.text import MIMEText
     try:
         sender = st.secrets["EMAIL_SENDER"]
         password = st.secrets["EMAIL_PASSWORD"]
@@ -24,7 +33,35 @@ def is_valid_email(email):
     return re.match(r"[^@]+@[^@]+\.[^@]+", email) if email else True
 
 def nuclear_clean(val):
+    """Single-value PIN clean-up. For whole columns use normalize.pins."""
     import pandas as pd
-    if pd.isna(val): return ""
-    s = str(val).strip().replace('.0', '')
-    return re.sub(r'\D', '', s)
+    return normalize.pins(pd.Series([val], dtype=object))[0]
+
+def hash_pin(pin):
+    """Keyed hash of a digits-only PIN, as held in the login index."""
+    return hmac.new(_PIN_KEY, str(pin).encode(), hashlib.sha256).digest()
+
+def build_login_index(staff_df):
+    """
+    {email: (pin_hash, role)} for every staff member, built in one vectorized
+    pass. The first row wins for duplicate emails (as the old table scan did).
+    """
+    if staff_df.empty or 'Email' not in staff_df.columns:
+        return {}
+    df = staff_df.assign(Email=normalize.emails(staff_df['Email']))
+    df = df.drop_duplicates('Email')
+    # PINs are already digit-cleaned at load time (see modules/schema.py)
+    pins = df['PIN'].fillna("").astype(str) if 'PIN' in df.columns else [""] * len(df)
+    roles = df['Role'].fillna('Staff').astype(str) if 'Role' in df.columns else ['Staff'] * len(df)
+    return {email: (hash_pin(pin), role) for email, pin, role in zip(df['Email'], pins, roles)}
+
+def load_login_index(get_data, db):
+    """Login index, rebuilt only when the Staff table changes (or its cache expires)."""
+    return db.cached(
+        ("login_index",), ["Staff"],
+        lambda: build_login_index(get_data("Staff", columns=["Email", "PIN", "Role"])),
+    )
+
+def check_pin(entry, pin):
+    """Constant-time PIN check against a login index entry. Empty PINs never match."""
+    return bool(pin) and hmac.compare_digest(entry[0], hash_pin(pin))
@@ -1,10 +1,12 @@
 import streamlit as st
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
-from google.oauth2 import service_account
 import io
 
 def upload_to_drive(file_obj, filename, folder_id):
+    # Google API client is heavy - import it only when an upload happens
+    from googleapiclient.discovery import build
+    from googleapiclient.http import MediaIoBaseUpload
+    from google.oauth2 import service_account
+
     creds_info = st.secrets["connections"]["gsheets"]
     creds = service_account.Credentials.from_service_account_info(
         creds_info, 
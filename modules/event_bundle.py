@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+
+import pandas as pd
+
+# Sheet name of every table that hangs off one Event_ID, keyed by EventBundle field
+BUNDLE_TABLES = {
+    "events": "Events",
+    "financials": "Event_Financials",
+    "contacts": "Event_Contacts",
+    "logistics": "Logistics_Details",
+    "reports": "Event_Reports",
+    "staffing": "Event_Staffing",
+}
+
+
+@dataclass
+class EventBundle:
+    """
+    Every row belonging to a single event, one DataFrame per child table.
+
+    Built by TwistedSupabase.read_event_bundle() so the Event Workspace
+    tabs only ever see (and download) the rows for the event on screen.
+    """
+    event_id: str
+    events: pd.DataFrame
+    financials: pd.DataFrame
+    contacts: pd.DataFrame
+    logistics: pd.DataFrame
+    reports: pd.DataFrame
+    staffing: pd.DataFrame
+
+    @classmethod
+    def from_frames(cls, event_id, frames):
+        """Build a bundle from a {sheet_name: DataFrame} dict (missing tables -> empty)."""
+        return cls(
+            event_id=str(event_id),
+            **{field: frames.get(sheet, pd.DataFrame()) for field, sheet in BUNDLE_TABLES.items()}
+        )
+
+    @property
+    def event(self):
+        """The core Events row as a Series, or None if the event doesn't exist."""
+        return None if self.events.empty else self.events.iloc[0]
+
+
+def load_event_bundle(eid, db):
+    """Rows for this one event from every child table (cost independent of archive size)."""
+    return db.cached(("event_bundle", str(eid)), BUNDLE_TABLES.values(), lambda: db.read_event_bundle(eid))
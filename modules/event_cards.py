@@ -0,0 +1,22 @@
+import pandas as pd
+
+# One row per event with everything a hub/archive card shows, maintained
+# server-side by the event_summary view (sql/event_summary.sql)
+CARD_TABLE = "Event_Summary"
+
+
+def load_event_cards(get_data, **query):
+    """
+    Card frame for the events matching query (see db.read_table), read
+    from the Event_Summary view instead of joining five tables per render.
+
+    Cached like any table read; a write to Events or one of its child
+    tables refreshes it (see DERIVED_TABLES in modules/supabase_db.py).
+    """
+    return get_data(CARD_TABLE, **query)
+
+
+def card_value(row, column, default):
+    """Card field or default when the event has no matching child row."""
+    val = row.get(column, default)
+    return default if pd.isna(val) else val
@@ -0,0 +1,78 @@
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+from modules.schema import REVERSE_COLUMN_MAP
+
+# The view definition shared with Supabase
+EVENT_SUMMARY_SQL = Path(__file__).resolve().parent.parent / "sql" / "event_summary.sql"
+
+# Base tables the view reads (and the columns it needs from each) - a write
+# to any of them changes event_summary
+SUMMARY_SOURCES = {
+    "events": ["id", "created_at", "event_id", "date", "end_date", "venue", "address", "maps_link",
+               "status", "is_multi_day", "organiser_name", "event_type"],
+    "event_financials": ["id", "created_at", "event_id", "rent_status", "rent"],
+    "event_contacts": ["id", "created_at", "event_id", "name", "role"],
+    "logistics_details": ["id", "created_at", "event_id", "setup_type", "bump_in", "bump_out"],
+    "event_reports": ["id", "created_at", "event_id", "weather"],
+}
+
+
+def _where(filters=None, date_range=None):
+    """SQL WHERE clause + params for the read_table filter keywords."""
+    clauses, params = [], []
+    for col, val in (filters or {}).items():
+        col = REVERSE_COLUMN_MAP.get(col, col)
+        if isinstance(val, (list, tuple, set)):
+            val = [str(v) for v in val]
+            clauses.append(f"{col} in ({','.join('?' * len(val))})")
+            params.extend(val)
+        else:
+            clauses.append(f"{col} = ?")
+            params.append(val)
+
+    if date_range:
+        col, start, end = date_range
+        col = REVERSE_COLUMN_MAP.get(col, col)
+        if start is not None:
+            clauses.append(f"{col} >= ?")
+            params.append(pd.Timestamp(start).date().isoformat())
+        if end is not None:
+            clauses.append(f"{col} <= ?")
+            params.append(pd.Timestamp(end).date().isoformat())
+
+    return (" where " + " and ".join(clauses) if clauses else ""), params
+
+
+def query_event_summary(raw_tables, columns=None, filters=None, date_range=None, order=None):
+    """
+    Run sql/event_summary.sql on raw Supabase-shaped frames in an in-memory
+    SQLite database and return the view's rows (raw snake_case columns).
+
+    Stand-in for the Supabase view in tests and local runs: same SQL, same
+    query keywords as TwistedSupabase.read_table.
+    """
+    with closing(sqlite3.connect(":memory:")) as con:
+        for table, needed in SUMMARY_SOURCES.items():
+            raw = raw_tables.get(table)
+            raw = pd.DataFrame(columns=needed) if raw is None else raw.reindex(columns=needed)
+            raw.astype(object).where(raw.notna(), None).to_sql(table, con, index=False)
+        con.executescript(EVENT_SUMMARY_SQL.read_text())
+
+        select = "*"
+        if columns:
+            select = ",".join(dict.fromkeys(["created_at", "id"] + [REVERSE_COLUMN_MAP.get(c, c) for c in columns]))
+        where, params = _where(filters, date_range)
+        sql = f"select {select} from event_summary{where}"
+        if order:
+            col, desc = order if isinstance(order, (list, tuple)) else (order, False)
+            col = REVERSE_COLUMN_MAP.get(col, col)
+            # nulls last, as the Supabase reads ask for
+            sql += f" order by {col} is null, {col} {'desc' if desc else 'asc'}, created_at, id"
+        else:
+            sql += " order by created_at, id"
+
+        return pd.read_sql_query(sql, con, params=params)
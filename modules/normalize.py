@@ -0,0 +1,62 @@
+import pandas as pd
+
+# Shared cleaners for whole columns. Each takes a Series and returns a
+# Series, using vectorized .str / regex ops - one pass per column instead
+# of a Python call per cell.
+
+# Float artefact from Sheets / Excel exports ("1234.0") - only at the end
+_TRAILING_ZERO = r'\.0+$'
+
+# 8:00 / 08:00 / 8.30 / 0830 / 8am / 5:30 pm
+_TIME_RE = r'^\s*(?P<h>\d{1,2})(?:[:.]?(?P<m>\d{2}))?\s*(?P<ampm>[ap]\.?m\.?)?\s*$'
+
+
+def _text(s):
+    """Stripped string dtype, with NaN/None kept as <NA>."""
+    return s.astype("string").str.strip()
+
+
+def pins(s):
+    """Digits-only PINs as text ("1234.0" -> "1234", but "10.05" -> "1005"). Blank -> ""."""
+    cleaned = _text(s).str.replace(_TRAILING_ZERO, '', regex=True)
+    return cleaned.str.replace(r'\D', '', regex=True).fillna("").astype(object)
+
+
+def phones(s):
+    """
+    Dialable phone numbers: digits (and a leading +) only, with the
+    Australian mobile fix-up - a 9-digit number starting with 4 lost its
+    leading 0 in Sheets. Blank -> None.
+    """
+    cleaned = _text(s).str.replace(_TRAILING_ZERO, '', regex=True)
+    cleaned = cleaned.str.replace(r'(?!^\+)[^\d]', '', regex=True)
+    cleaned = cleaned.mask(cleaned.str.fullmatch(r'4\d{8}', na=False), "0" + cleaned)
+    cleaned = cleaned.mask(cleaned.isin(["", "+"]))
+    return cleaned.astype(object).where(cleaned.notna(), None)
+
+
+def emails(s):
+    """Lower-cased, stripped emails. Blank -> ""."""
+    return _text(s).str.lower().fillna("").astype(object)
+
+
+def time_minutes(s):
+    """Minutes after midnight (nullable Int64) for time strings; <NA> when unparseable."""
+    parts = _text(s).str.lower().str.extract(_TIME_RE)
+    hours = pd.to_numeric(parts['h'], errors='coerce')
+    minutes = pd.to_numeric(parts['m'], errors='coerce').fillna(0)
+
+    is_pm = parts['ampm'].str.startswith('p', na=False)
+    is_am = parts['ampm'].str.startswith('a', na=False)
+    hours = hours.mask(is_pm & (hours < 12), hours + 12).mask(is_am & (hours == 12), 0)
+
+    total = hours * 60 + minutes
+    valid = hours.between(0, 23) & minutes.between(0, 59) & ~(parts['ampm'].notna() & (parts['h'].astype(float) > 12))
+    return total.where(valid).astype("Int64")
+
+
+def times(s):
+    """Times as "HH:MM". Values that don't parse as a time are kept as typed."""
+    mins = time_minutes(s)
+    formatted = (mins // 60).astype("string").str.zfill(2) + ":" + (mins % 60).astype("string").str.zfill(2)
+    return formatted.fillna(_text(s)).astype(object).where(s.notna(), None)
@@ -0,0 +1,180 @@
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+
+import pandas as pd
+
+from modules.normalize import time_minutes
+
+DAY = 24 * 60
+
+
+@dataclass(frozen=True)
+class Shift:
+    """One staff member's shift on one day, in minutes after midnight."""
+    staff: str
+    day: object  # datetime.date
+    start: int
+    end: int
+    event_id: str
+
+    @property
+    def label(self):
+        return f"{self.start // 60:02d}:{self.start % 60:02d}-{(self.end // 60) % 24:02d}:{self.end % 60:02d}"
+
+
+def shift_days(df_staffing, df_events):
+    """
+    One row per (assignment, event day) with Staff_Name, Day, Start, End,
+    Event_ID - built with vectorized ops (a multi-day event repeats the
+    shift on each of its days). Rows whose times don't parse are dropped.
+    """
+    cols = ['Staff_Name', 'Day', 'Start', 'End', 'Event_ID']
+    if df_staffing.empty or df_events.empty:
+        return pd.DataFrame(columns=cols)
+
+    events = df_events[['Event_ID', 'Date', 'End_Date']].assign(Event_ID=df_events['Event_ID'].astype(str))
+    shifts = df_staffing.assign(
+        Event_ID=df_staffing['Event_ID'].astype(str),
+        Start=time_minutes(df_staffing['Start_Time']),
+        End=time_minutes(df_staffing['End_Time']),
+    ).merge(events, on='Event_ID', how='inner')
+    shifts = shifts.dropna(subset=['Start', 'End', 'Date'])
+    if shifts.empty:
+        return pd.DataFrame(columns=cols)
+
+    # Overnight shifts (end <= start) finish the next morning
+    shifts = shifts.assign(End=shifts['End'].where(shifts['End'] > shifts['Start'], shifts['End'] + DAY))
+
+    end_date = shifts['End_Date'].fillna(shifts['Date']).where(lambda d: d >= shifts['Date'], shifts['Date'])
+    n_days = (end_date - shifts['Date']).dt.days.astype(int) + 1
+    shifts = shifts.loc[shifts.index.repeat(n_days)]
+    offset = shifts.groupby(level=0).cumcount()
+    shifts = shifts.assign(Day=(shifts['Date'] + pd.to_timedelta(offset, unit='D')).dt.date)
+
+    return shifts[cols].astype({'Start': int, 'End': int}).reset_index(drop=True)
+
+
+class RosterIndex:
+    """
+    Interval index of every rostered shift, keyed by (staff, day).
+
+    Per key the shifts are sorted by start with a running maximum of their
+    ends, so "does [start, end) overlap anything?" is one bisect plus one
+    lookup - O(log n) however big the season gets. Shifts running past
+    midnight are also indexed on the next day for the part after 00:00.
+    A day -> {staff: event ids} map answers "who is busy that day".
+    """
+
+    def __init__(self, shifts):
+        buckets = defaultdict(list)
+        for row in shifts.itertuples(index=False):
+            shift = Shift(row.Staff_Name, row.Day, row.Start, row.End, row.Event_ID)
+            buckets[(shift.staff, shift.day)].append((shift.start, shift.end, shift))
+            if shift.end > DAY:
+                buckets[(shift.staff, shift.day + timedelta(days=1))].append((0, shift.end - DAY, shift))
+
+        self._clashes = None
+        self._by_day = defaultdict(lambda: defaultdict(set))
+        self._index = {}
+        for key, items in buckets.items():
+            staff, day = key
+            self._by_day[day][staff].update(shift.event_id for _, _, shift in items)
+            items.sort(key=lambda item: item[0])
+            starts = [item[0] for item in items]
+            max_end, running = [], 0
+            for item in items:
+                running = max(running, item[1])
+                max_end.append(running)
+            self._index[key] = (starts, max_end, items)
+
+    def has_conflict(self, staff, day, start, end, exclude_event=None):
+        """True if [start, end) overlaps a shift of staff on day - O(log n)."""
+        return bool(self.conflicts(staff, day, start, end, exclude_event, first_only=True))
+
+    def conflicts(self, staff, day, start, end, exclude_event=None, first_only=False):
+        """Shifts of staff on day overlapping [start, end) minutes (end may exceed 24:00)."""
+        if end <= start:
+            end += DAY
+
+        found = self._conflicts_on(staff, day, start, end, exclude_event, first_only)
+        if end > DAY and not (first_only and found):
+            found += self._conflicts_on(staff, day + timedelta(days=1), 0, end - DAY, exclude_event, first_only)
+        return found
+
+    def _conflicts_on(self, staff, day, start, end, exclude_event, first_only):
+        entry = self._index.get((staff, day))
+        if entry is None:
+            return []
+        starts, max_end, items = entry
+
+        # Only shifts starting before `end` can overlap; none do if their ends all stop by `start`
+        i = bisect_left(starts, end)
+        if i == 0 or max_end[i - 1] <= start:
+            return []
+
+        found = []
+        for item_start, item_end, shift in items[:i]:
+            if item_end > start and shift.event_id != exclude_event:
+                found.append(shift)
+                if first_only:
+                    break
+        return found
+
+    def validate(self):
+        """
+        Every pair of overlapping shifts in the roster, from one sweep over
+        each (staff, day) list (already sorted by start) - O(n) on top of
+        the index. Computed once per index. Returns Staff_Name, Day,
+        Event_ID, Shift, Clashes_With, Other_Shift.
+        """
+        if self._clashes is None:
+            rows, seen = [], set()
+            for (staff, day), (_, _, items) in sorted(self._index.items()):
+                active = []  # shifts still running at the current start
+                for start, end, shift in items:
+                    active = [a for a in active if a[1] > start]
+                    for _, _, other in active:
+                        pair = (other, shift)
+                        if other.event_id != shift.event_id and pair not in seen:
+                            seen.add(pair)
+                            rows.append({
+                                "Staff_Name": staff, "Day": other.day,
+                                "Event_ID": shift.event_id, "Shift": shift.label,
+                                "Clashes_With": other.event_id, "Other_Shift": other.label,
+                            })
+                    active.append((start, end, shift))
+            self._clashes = pd.DataFrame(rows, columns=["Staff_Name", "Day", "Event_ID", "Shift", "Clashes_With", "Other_Shift"])
+        return self._clashes
+
+    def busy_staff(self, days, exclude_event=None):
+        """Staff with any shift on one of days (other than exclude_event) - only those days are looked at."""
+        return {
+            staff
+            for day in set(days) if day in self._by_day
+            for staff, event_ids in self._by_day[day].items()
+            if event_ids - {exclude_event}
+        }
+
+
+def event_days(event):
+    """Every date an Events row runs (Date through End_Date), [] if undated."""
+    if event is None or pd.isna(event.get('Date')):
+        return []
+    start = pd.Timestamp(event['Date'])
+    end = pd.Timestamp(event['End_Date']) if pd.notna(event.get('End_Date')) else start
+    return [d.date() for d in pd.date_range(start, max(start, end))]
+
+
+def load_roster_index(get_data, db):
+    """
+    Season-wide RosterIndex, rebuilt only after a write to Event_Staffing or
+    Events. Both are read whole (no column list) so they come from the
+    incremental sync rather than a full download per rebuild.
+    """
+    def build():
+        df_staffing, df_events = get_data("Event_Staffing", "Events")
+        return RosterIndex(shift_days(df_staffing, df_events))
+
+    return db.cached(("roster_index",), ["Event_Staffing", "Events"], build)
@@ -0,0 +1,193 @@
+from dataclasses import dataclass
+
+import pandas as pd
+
+from modules import normalize
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    """
+    One table's layout: Supabase table name, Title_Case columns with their
+    dtype, and the natural key used for keyed saves.
+
+    Supabase column names are always the lower-cased Title_Case name
+    (Event_ID <-> event_id), so the name mapping is derived, not listed.
+    """
+    table: str
+    columns: dict
+    keys: tuple = ()
+
+
+# Column dtypes:
+#   "str"    - left as delivered
+#   "date"   - ISO date -> datetime64 (NaT when blank/invalid)
+#   "int"    - numeric, rounded, nullable Int64
+#   "float"  - numeric float (NaN when blank/invalid)
+#   "digits" - digits only, as text (PINs)
+#   "phone"  - dialable number, AU mobile leading 0 restored (None when blank)
+#   "email"  - lower-cased, stripped
+#   "time"   - "HH:MM" where the text parses as a time, else kept as typed
+#   "bool"   - true/false (also 0/1 from SQLite), blank -> False
+SCHEMAS = {
+    "Staff": TableSchema("staff", {
+        "Email": "email", "Name": "str", "Role": "str", "PIN": "digits",
+        "Type": "str", "Phone": "phone", "Photo": "str",
+    }, keys=("Email",)),
+
+    "Events": TableSchema("events", {
+        "Event_ID": "str", "Date": "date", "End_Date": "date", "Venue": "str",
+        "Address": "str", "Maps_Link": "str", "Status": "str", "Is_Multi_Day": "str",
+        "Contact_Type": "str", "Notes": "str", "Last_Edited_By": "str",
+        "Organiser_Name": "str", "Event_Type": "str",
+    }, keys=("Event_ID",)),
+
+    "Event_Financials": TableSchema("event_financials", {
+        "Event_ID": "str", "Rent": "float", "Rent_Status": "str",
+        "Rent_Paid_Date": "str", "Rent_Due_Date": "str", "Cleaning_Deposit": "float",
+        "Deposit_Paid": "str", "Deposit_Refunded": "str", "Fee_Structure": "str",
+        "Commission_Rate": "float", "Deposit": "float", "Payment_Date": "str",
+        "Due_Date": "str",
+    }, keys=("Event_ID",)),
+
+    "Event_Contacts": TableSchema("event_contacts", {
+        "Contact_ID": "str", "Event_ID": "str", "Name": "str", "Role": "str",
+        "Phone": "phone", "Email": "email", "Preferred_Method": "str", "Pref_Method": "str",
+    }, keys=("Contact_ID",)),
+
+    "Logistics_Details": TableSchema("logistics_details", {
+        "Event_ID": "str", "Bump_In": "time", "Bump_Out": "time", "Setup_Type": "str",
+        "Power": "str", "Water": "str", "Comments": "str", "Parking": "str",
+        "Log_Notes": "str",
+    }, keys=("Event_ID",)),
+
+    # Report_Date stays as the dd/mm/YYYY text the reports tab keys on
+    "Event_Reports": TableSchema("event_reports", {
+        "Event_ID": "str", "Report_Date": "str", "Weather": "str", "Time_Leave": "time",
+        "Time_Reach": "time", "Other_Stalls": "int", "Water_Access": "str",
+        "Power_Access": "str", "General_Comments": "str",
+    }, keys=("Event_ID", "Report_Date")),
+
+    "Inventory": TableSchema("inventory", {
+        "Event_ID": "str", "Item_Name": "str", "Start_Qty": "int", "End_Qty": "int",
+        "Sold_Qty": "int", "Waste": "int",
+    }, keys=("Event_ID", "Item_Name")),
+
+    # One ledger row per event and trading day (sql/sales_ledger.sql)
+    "Event_Sales": TableSchema("event_sales", {
+        "Event_ID": "str", "Sale_Date": "date", "Opening_Float": "float",
+        "Cash_Sales": "float", "Card_Sales": "float", "Closing_Float": "float",
+        "Quick_Sales": "float", "Food_Sales": "float", "Drinks_Sales": "float",
+        "Uncategorised_Sales": "float", "Total_Revenue": "float",
+    }, keys=("Event_ID", "Sale_Date")),
+
+    # Read-only sales totals computed in the database (sql/sales_ledger.sql)
+    "Sales_Daily": TableSchema("sales_daily", {
+        "Event_ID": "str", "Sale_Date": "date", "Card_Sales": "float", "Cash_Sales": "float",
+        "Quick_Sales": "float", "Food_Sales": "float", "Drinks_Sales": "float",
+        "Uncategorised_Sales": "float", "Total_Revenue": "float",
+    }),
+    "Sales_By_Event": TableSchema("sales_by_event", {
+        "Event_ID": "str", "Trading_Days": "int", "Total_Revenue": "float",
+    }),
+    "Sales_By_Venue": TableSchema("sales_by_venue", {
+        "Venue": "str", "Events": "int", "Total_Revenue": "float",
+    }),
+    "Sales_By_Month": TableSchema("sales_by_month", {
+        "Month": "str", "Total_Revenue": "float",
+    }),
+
+    "Event_Staffing": TableSchema("event_staffing", {
+        "Event_ID": "str", "Staff_Name": "str", "Start_Time": "time", "End_Time": "time",
+        "Break_Time": "str", "Payment_Method": "str", "Payment_Status": "str",
+        "Type": "str",
+    }, keys=("Event_ID", "Staff_Name")),
+
+    "Staff_Database": TableSchema("staff_database", {
+        "Staff_Name": "str", "Phone": "phone", "Address": "str", "Hourly_Rate": "float",
+        "TFN": "str", "Photo_URL": "str", "Skills": "str", "Rating": "float",
+    }, keys=("Staff_Name",)),
+
+    # Read-only view: one denormalized card row per event (sql/event_summary.sql)
+    "Event_Summary": TableSchema("event_summary", {
+        "Event_ID": "str", "Date": "date", "End_Date": "date", "Venue": "str",
+        "Address": "str", "Maps_Link": "str", "Status": "str", "Is_Multi_Day": "str",
+        "Organiser_Name": "str", "Event_Type": "str", "Rent_Status": "str",
+        "Rent": "float", "Primary_Contact_Name": "str", "First_Contact_Name": "str",
+        "Setup_Type": "str", "Bump_In": "str", "Bump_Out": "str", "Weather": "str",
+        "Has_Logistics": "bool", "Has_Report": "bool",
+    }),
+
+    # Revenue cube kept current by a trigger on event_sales (sql/revenue_rollup.sql)
+    "Revenue_Rollup": TableSchema("revenue_rollup", {
+        "Grain": "str", "Period": "date", "Venue": "str", "Event_Type": "str",
+        "Setup_Type": "str", "Revenue": "float", "Sales_Days": "int",
+    }),
+
+    # Geocoded coordinates per event address (see modules/venues.py)
+    "Venues": TableSchema("venues", {
+        "Address_Hash": "str", "Address": "str", "Lat": "float", "Lon": "float",
+    }, keys=("Address_Hash",)),
+}
+
+# --- Derived lookups (built once at import) ---
+SCHEMAS_BY_TABLE = {schema.table: schema for schema in SCHEMAS.values()}
+
+# Sheet name -> Supabase table
+TABLE_MAP = {sheet: schema.table for sheet, schema in SCHEMAS.items()}
+
+# Supabase lowercase_underscore -> your Title_Case
+COLUMN_MAP = {col.lower(): col for schema in SCHEMAS.values() for col in schema.columns}
+
+# Title_Case -> lowercase_underscore for Supabase
+REVERSE_COLUMN_MAP = {v: k for k, v in COLUMN_MAP.items()}
+
+# Natural key of each table (Supabase names) - used to target single rows on save
+NATURAL_KEYS = {
+    schema.table: [REVERSE_COLUMN_MAP[k] for k in schema.keys]
+    for schema in SCHEMAS.values() if schema.keys
+}
+
+
+# --- Vectorized converters, one pass per column ---
+def _to_date(s):
+    return pd.to_datetime(s, errors='coerce', format='ISO8601')
+
+def _to_int(s):
+    return pd.to_numeric(s, errors='coerce').round().astype("Int64")
+
+def _to_float(s):
+    return pd.to_numeric(s, errors='coerce').astype(float)
+
+def _to_bool(s):
+    return s.isin([True, 1, "true", "t", "1"])
+
+CONVERTERS = {
+    "date": _to_date,
+    "int": _to_int,
+    "float": _to_float,
+    "digits": normalize.pins,
+    "phone": normalize.phones,
+    "email": normalize.emails,
+    "time": normalize.times,
+    "bool": _to_bool,
+}
+
+
+def coerce_frame(table, df):
+    """
+    Convert a Title_Case frame to its declared dtypes in one vectorized pass.
+
+    Run once when a table is loaded, so pages receive ready-typed data
+    instead of re-parsing dates and numbers on every rerun.
+    """
+    schema = SCHEMAS_BY_TABLE.get(table)
+    if schema is None or df.empty:
+        return df
+
+    converted = {
+        col: CONVERTERS[dtype](df[col])
+        for col, dtype in schema.columns.items()
+        if dtype in CONVERTERS and col in df.columns
+    }
+    return df.assign(**converted) if converted else df
@@ -0,0 +1,142 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+# Fields searched by the archive, with the weight of a hit in each
+SEARCH_FIELDS = {
+    "Venue": 3.0,
+    "Event_ID": 3.0,
+    "Organiser_Name": 2.0,
+    "Contact_Name": 2.0,
+    "Address": 1.0,
+}
+
+# Match quality of a query token against an indexed token
+EXACT, PREFIX, FUZZY = 1.0, 0.7, 0.4
+FUZZY_CUTOFF = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lower-cased alphanumeric tokens of a value (NaN/None -> none)."""
+    if text is None or text != text:
+        return []
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def _trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """
+    Inverted index over the archive's searchable fields.
+
+    Built once per data version (see load_search_index). Each token maps
+    to the events containing it with their best field weight. Lookups are
+    exact, prefix (bisect over the sorted vocabulary) or fuzzy (trigram
+    candidates ranked by similarity, for typos), so a search never scans
+    the event rows.
+    """
+
+    def __init__(self, documents):
+        """documents: iterable of (event_id, {field: text})."""
+        postings = defaultdict(dict)
+        for event_id, fields in documents:
+            for field, text in fields.items():
+                weight = SEARCH_FIELDS.get(field, 1.0)
+                for token in tokenize(text):
+                    if postings[token].get(event_id, 0) < weight:
+                        postings[token][event_id] = weight
+
+        self._postings = dict(postings)
+        self._vocab = sorted(self._postings)
+        self._grams = defaultdict(set)
+        for token in self._vocab:
+            for gram in _trigrams(token):
+                self._grams[gram].add(token)
+
+    def __len__(self):
+        return len(self._vocab)
+
+    def _prefix_matches(self, term):
+        i = bisect_left(self._vocab, term)
+        while i < len(self._vocab) and self._vocab[i].startswith(term):
+            yield self._vocab[i]
+            i += 1
+
+    def _fuzzy_matches(self, term):
+        # Tokens sharing a trigram with the term are the only candidates
+        candidates = set()
+        for gram in _trigrams(term):
+            candidates |= self._grams.get(gram, set())
+        for token in candidates:
+            if abs(len(token) - len(term)) > 2:
+                continue
+            similarity = SequenceMatcher(None, term, token).ratio()
+            if similarity >= FUZZY_CUTOFF:
+                yield token, similarity
+
+    def _term_scores(self, term):
+        """{event_id: best score} for one query token."""
+        scores = {}
+
+        def add(token, quality):
+            for event_id, weight in self._postings[token].items():
+                scores[event_id] = max(scores.get(event_id, 0), weight * quality)
+
+        for token in self._prefix_matches(term):
+            add(token, EXACT if token == term else PREFIX)
+        if not scores and len(term) >= 3:
+            for token, similarity in self._fuzzy_matches(term):
+                add(token, FUZZY * similarity)
+        return scores
+
+    def search(self, query):
+        """
+        {event_id: score} for events matching every token of the query,
+        higher is better. An empty query returns None (no filtering).
+        """
+        terms = tokenize(query)
+        if not terms:
+            return None
+
+        result = None
+        for term in dict.fromkeys(terms):
+            scores = self._term_scores(term)
+            if result is None:
+                result = scores
+            else:
+                result = {eid: result[eid] + s for eid, s in scores.items() if eid in result}
+            if not result:
+                return {}
+        return result
+
+
+def build_search_index(df_events, df_contacts):
+    """Index every event under its own fields plus the names of all its contacts."""
+    contact_names = defaultdict(list)
+    if not df_contacts.empty and {'Event_ID', 'Name'}.issubset(df_contacts.columns):
+        for eid, name in zip(df_contacts['Event_ID'].astype(str), df_contacts['Name']):
+            contact_names[eid].append(name)
+
+    fields = [f for f in SEARCH_FIELDS if f in df_events.columns and f != "Contact_Name"]
+    documents = []
+    for record in df_events[['Event_ID'] + [f for f in fields if f != 'Event_ID']].to_dict('records'):
+        eid = str(record['Event_ID'])
+        record['Event_ID'] = eid
+        record['Contact_Name'] = " ".join(str(n) for n in contact_names.get(eid, []) if n == n)
+        documents.append((eid, record))
+    return SearchIndex(documents)
+
+
+def load_search_index(get_data, db):
+    """Archive search index, rebuilt only after a write to Events or Event_Contacts."""
+    def build():
+        df_events, df_contacts = get_data("Events", "Event_Contacts")
+        return build_search_index(df_events, df_contacts)
+
+    return db.cached(("search_index",), ["Events", "Event_Contacts"], build)
@@ -1,284 +1,502 @@
+import logging
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
 import pandas as pd
 from supabase import create_client, Client
 
+from modules.event_bundle import BUNDLE_TABLES, EventBundle
+from modules.schema import TABLE_MAP, COLUMN_MAP, REVERSE_COLUMN_MAP, NATURAL_KEYS, coerce_frame
+from modules.table_cache import TableCache
+from modules.local_summary import SUMMARY_SOURCES, query_event_summary
+
+logger = logging.getLogger(__name__)
+
+# Rows asked for per page. The project's max-rows setting may cap pages lower,
+# so paging only ends on an empty page, never on a short one.
+PAGE_SIZE = 1000
+
+# Seconds a cached read stays valid when nothing in this app writes to its table
+CACHE_TTL = 60
+
+# On-disk table snapshots for warm restarts (override with TABLE_SNAPSHOT_DIR in secrets)
+DEFAULT_SNAPSHOT_DIR = Path(__file__).resolve().parent.parent / ".table_snapshots"
+
+# Tables holding PINs / TFNs are never written to disk
+SNAPSHOT_EXCLUDE = {"staff", "staff_database"}
+
+# Aggregate views with no created_at - paged on id alone (their row order is
+# arbitrary anyway). Everything else pages in insertion order, (created_at, id).
+ID_ONLY_TABLES = {"sales_daily", "sales_by_event", "sales_by_venue", "sales_by_month"}
+
+# updated_at is now() - the writing transaction's start - so a row can commit
+# after a sync with a stamp older than the watermark. Each sync re-reads this
+# many seconds before the watermark to catch it.
+SYNC_OVERLAP_SECONDS = 30
+
+# Upper bound on concurrent table fetches in read_tables()
+MAX_PARALLEL_READS = 8
+
+# Server-side views / trigger-maintained tables and the tables they read
+# (a write to one refreshes them)
+DERIVED_TABLES = {
+    "event_summary": tuple(SUMMARY_SOURCES),
+    "sales_daily": ("event_sales",),
+    "sales_by_event": ("event_sales",),
+    "sales_by_venue": ("event_sales", "events"),
+    "sales_by_month": ("event_sales",),
+    "revenue_rollup": ("event_sales",),
+}
+
+
 class TwistedSupabase:
     def __init__(self):
         """Initialize Supabase connection"""
         self.url = st.secrets["SUPABASE_URL"]
         self.key = st.secrets["SUPABASE_ANON_KEY"]
         self.client: Client = create_client(self.url, self.key)
-    
-    def read_table(self, sheet_name):
+
+        # Local copy of each synced table: {table: (raw_df, updated_at watermark)}
+        self._snapshots = {}
+        self.snapshot_dir = Path(st.secrets.get("TABLE_SNAPSHOT_DIR", DEFAULT_SNAPSHOT_DIR))
+        self._sync_locks = defaultdict(threading.Lock)
+        self._synced_tables = None  # tables with the updated_at trigger, see _can_sync
+
+        # Shared read cache, invalidated per table by the write methods below
+        self.cache = TableCache(ttl=CACHE_TTL, derived=DERIVED_TABLES)
+
+        # Build event_summary locally in SQLite (same SQL) where the view isn't deployed
+        self.local_summary = bool(st.secrets.get("EVENT_SUMMARY_LOCAL", False))
+
+    def _table(self, sheet_name):
+        """Resolve a sheet name (or raw table name) to its Supabase table."""
+        return TABLE_MAP.get(sheet_name, sheet_name.lower())
+
+    def _to_db_row(self, row):
+        """Rename a Title_Case row dict to Supabase column names."""
+        return {REVERSE_COLUMN_MAP.get(k, k): v for k, v in row.items()}
+
+    def _sort_keys(self, actual_table):
+        """Columns a table is paged and ordered by - insertion order, id as the tie-breaker."""
+        return ["id"] if actual_table in ID_ONLY_TABLES else ["created_at", "id"]
+
+    def _select_columns(self, actual_table, columns):
+        """Map a Title_Case column list to a PostgREST select string (paging keys are always kept)."""
+        if not columns:
+            return "*"
+        keys = self._sort_keys(actual_table)
+        return ",".join(dict.fromkeys(keys + [REVERSE_COLUMN_MAP.get(c, c) for c in columns]))
+
+    def _filter(self, query, filters=None, date_range=None):
         """
-        Read table as DataFrame - EXACT REPLACEMENT for get_data()
-        
-        Maps your Google Sheets names to Supabase tables
+        Push filters down to PostgREST.
+
+        filters:    {column: value} -> eq, {column: [values]} -> in
+        date_range: (column, start, end) -> gte/lte, either bound may be None
+        """
+        for col, val in self._to_db_row(filters or {}).items():
+            if isinstance(val, (list, tuple, set)):
+                query = query.in_(col, [str(v) for v in val])
+            else:
+                query = query.eq(col, val)
+
+        if date_range:
+            col, start, end = date_range
+            col = REVERSE_COLUMN_MAP.get(col, col)
+            if start is not None:
+                query = query.gte(col, pd.Timestamp(start).date().isoformat())
+            if end is not None:
+                query = query.lte(col, pd.Timestamp(end).date().isoformat())
+        return query
+
+    def _to_sheet_frame(self, raw):
+        """Rename raw Supabase rows to Title_Case and drop internal columns."""
+        # Rename columns to match your existing code
+        df = raw.rename(columns=COLUMN_MAP)
+
+        # Remove internal columns that don't exist in Google Sheets
+        columns_to_remove = ['id', 'created_at', 'updated_at']
+        return df.drop(columns=[col for col in columns_to_remove if col in df.columns], errors='ignore')
+
+    def _iter_raw(self, actual_table, chunk_size=PAGE_SIZE, since=None,
+                  columns=None, filters=None, date_range=None, order=None):
+        """
+        Yield raw rows as DataFrame chunks, PAGE_SIZE rows at a time.
+
+        A single select() silently stops at the server's max-rows limit, and
+        that limit is a dashboard setting, so a page shorter than chunk_size
+        doesn't mean the table is done - reading stops at the first empty
+        page (one extra round trip per read). Unordered reads use keyset pagination on (created_at, id), so rows
+        come back in insertion order and paging never skips or repeats rows
+        while other writes happen; an explicit order falls back to range
+        pagination with the same keys as tie-breakers.
         """
-        # Exact mapping of your sheet names
-        table_map = {
-            "Staff": "staff",
-            "Events": "events",
-            "Event_Financials": "event_financials",
-            "Event_Contacts": "event_contacts",
-            "Logistics_Details": "logistics_details",
-            "Event_Reports": "event_reports",
-            "Inventory": "inventory",
-            "Event_Sales": "event_sales",
-            "Event_Staffing": "event_staffing",
-            "Staff_Database": "staff_database"
-        }
-        
-        actual_table = table_map.get(sheet_name, sheet_name.lower())
-        
+        keys = self._sort_keys(actual_table)
+        last = None
+        offset = 0
+        while True:
+            query = self._filter(
+                self.client.table(actual_table).select(self._select_columns(actual_table, columns)), filters, date_range
+            )
+            if since is not None:
+                query = query.gte("updated_at", since)
+
+            if order:
+                col, desc = order if isinstance(order, (list, tuple)) else (order, False)
+                # Nulls last both ways: Postgres puts NULLs first on desc
+                query = query.order(REVERSE_COLUMN_MAP.get(col, col), desc=desc, nullsfirst=False)
+                for key in keys:
+                    query = query.order(key)
+                query = query.range(offset, offset + chunk_size - 1)
+            else:
+                for key in keys:
+                    query = query.order(key)
+                query = query.limit(chunk_size)
+                if last is not None:
+                    query = self._after(query, keys, last)
+
+            rows = query.execute().data
+            if not rows:
+                return
+            yield pd.DataFrame(rows)
+            last = rows[-1]
+            offset += len(rows)
+
+    def _after(self, query, keys, row):
+        """Keyset filter: rows sorting after row on (created_at, id) or id."""
+        if keys == ["id"]:
+            return query.gt("id", row["id"])
+        stamp, row_id = row["created_at"], row["id"]
+        return query.or_(f'created_at.gt."{stamp}",and(created_at.eq."{stamp}",id.gt.{row_id})')
+
+    def _in_order(self, actual_table, raw):
+        """Raw frame sorted by its paging keys (after merging synced changes)."""
+        keys = [k for k in self._sort_keys(actual_table) if k in raw.columns]
+        return raw.sort_values(keys, kind="stable", ignore_index=True) if keys else raw
+
+    def _fetch_raw(self, actual_table, since=None, **query):
+        """Build one raw frame from paged chunks (one chunk of dicts in memory at a time)."""
+        chunks = list(self._iter_raw(actual_table, since=since, **query))
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+    def _watermark(self, raw):
+        """Latest updated_at in a raw frame, as an ISO timestamp."""
+        return pd.to_datetime(raw['updated_at'], utc=True, format='ISO8601').max().isoformat()
+
+    def _read_snapshot_file(self, actual_table):
+        """Last persisted snapshot of a table, or None if there is no usable file."""
+        path = self.snapshot_dir / f"{actual_table}.parquet"
+        if actual_table in SNAPSHOT_EXCLUDE or not path.exists():
+            return None
+        try:
+            raw = pd.read_parquet(path)
+        except Exception as e:
+            logger.warning("Ignoring unreadable snapshot %s: %s", path, e)
+            return None
+        if raw.empty or not {'id', 'updated_at'}.issubset(raw.columns):
+            return None
+        return raw, self._watermark(raw)
+
+    def _write_snapshot_file(self, actual_table, raw):
+        """Persist a snapshot atomically. Best effort - a failed write only costs the next cold start."""
+        if actual_table in SNAPSHOT_EXCLUDE:
+            return
+        path = self.snapshot_dir / f"{actual_table}.parquet"
         try:
-            response = self.client.table(actual_table).select("*").execute()
-            
-            if response.data:
-                df = pd.DataFrame(response.data)
-                
-                # Convert column names to match Google Sheets format
-                # Supabase uses lowercase_underscore, you use Title_Case
-                column_name_map = {
-                    # Staff
-                    "email": "Email",
-                    "name": "Name", 
-                    "role": "Role",
-                    "pin": "PIN",
-                    "type": "Type",
-                    "phone": "Phone",
-                    "photo": "Photo",
-                    
-                    # Events
-                    "event_id": "Event_ID",
-                    "date": "Date",
-                    "end_date": "End_Date",
-                    "venue": "Venue",
-                    "address": "Address",
-                    "maps_link": "Maps_Link",
-                    "status": "Status",
-                    "is_multi_day": "Is_Multi_Day",
-                    "contact_type": "Contact_Type",
-                    "notes": "Notes",
-                    "last_edited_by": "Last_Edited_By",
-                    "organiser_name": "Organiser_Name",
-                    "event_type": "Event_Type",
-                    
-                    # Financials
-                    "rent": "Rent",
-                    "rent_status": "Rent_Status",
-                    "rent_paid_date": "Rent_Paid_Date",
-                    "rent_due_date": "Rent_Due_Date",
-                    "cleaning_deposit": "Cleaning_Deposit",
-                    "deposit_paid": "Deposit_Paid",
-                    "deposit_refunded": "Deposit_Refunded",
-                    "fee_structure": "Fee_Structure",
-                    "commission_rate": "Commission_Rate",
-                    "deposit": "Deposit",
-                    "payment_date": "Payment_Date",
-                    "due_date": "Due_Date",
-                    
-                    # Contacts
-                    "contact_id": "Contact_ID",
-                    "preferred_method": "Preferred_Method",
-                    "pref_method": "Pref_Method",
-                    
-                    # Logistics
-                    "bump_in": "Bump_In",
-                    "bump_out": "Bump_Out",
-                    "setup_type": "Setup_Type",
-                    "power": "Power",
-                    "water": "Water",
-                    "comments": "Comments",
-                    
-                    # Reports
-                    "report_date": "Report_Date",
-                    "weather": "Weather",
-                    "time_leave": "Time_Leave",
-                    "time_reach": "Time_Reach",
-                    "other_stalls": "Other_Stalls",
-                    "water_access": "Water_Access",
-                    "power_access": "Power_Access",
-                    "general_comments": "General_Comments",
-                    
-                    # Inventory
-                    "item_name": "Item_Name",
-                    "start_qty": "Start_Qty",
-                    "end_qty": "End_Qty",
-                    "sold_qty": "Sold_Qty",
-                    "waste": "Waste",
-                    
-                    # Sales
-                    "opening_float": "Opening_Float",
-                    "cash_sales": "Cash_Sales",
-                    "card_sales": "Card_Sales",
-                    "closing_float": "Closing_Float",
-                    "total_revenue": "Total_Revenue",
-                    
-                    # Staffing
-                    "staff_name": "Staff_Name",
-                    "start_time": "Start_Time",
-                    "end_time": "End_Time",
-                    "break_time": "Break_Time",
-                    "payment_method": "Payment_Method",
-                    "payment_status": "Payment_Status",
-                    
-                    # Staff Database
-                    "hourly_rate": "Hourly_Rate",
-                    "tfn": "TFN",
-                    "photo_url": "Photo_URL",
-                    "skills": "Skills",
-                    "rating": "Rating"
-                }
-                
-                # Rename columns to match your existing code
-                df = df.rename(columns=column_name_map)
-                
-                # Remove internal columns that don't exist in Google Sheets
-                columns_to_remove = ['id', 'created_at', 'updated_at']
-                df = df.drop(columns=[col for col in columns_to_remove if col in df.columns], errors='ignore')
-                
-                return df
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".parquet.tmp")
+            raw.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning("Could not write snapshot %s: %s", path, e)
+
+    def _can_sync(self, actual_table):
+        """
+        True if the table stamps updated_at on every UPDATE (sql/updated_at.sql).
+
+        Without the trigger an edited row keeps its old updated_at and the
+        incremental sync would never see the edit, so those tables are read in
+        full. Asked once per process; if the check fails nothing is synced.
+        """
+        if self._synced_tables is None:
+            try:
+                rows = self.client.rpc("updated_at_tables").execute().data or []
+                self._synced_tables = frozenset(row["table_name"] for row in rows)
+            except Exception as e:
+                logger.warning("updated_at_tables() unavailable, reading tables in full: %s", e)
+                self._synced_tables = frozenset()
+        return actual_table in self._synced_tables
+
+    def _sync_table(self, actual_table):
+        """
+        Bring the local snapshot of a table up to date and return it.
+
+        The first call after a restart starts from the Parquet snapshot on
+        disk (or downloads the table if there is none); later calls only fetch
+        rows whose updated_at is at or past the stored watermark (less
+        SYNC_OVERLAP_SECONDS for late commits). If the local row count still
+        differs from a cheap exact remote count - rows deleted, or a change
+        missed anyway - the table is reloaded in full.
+        """
+        with self._sync_locks[actual_table]:
+            snapshot = self._snapshots.get(actual_table) or self._read_snapshot_file(actual_table)
+            dirty = True
+
+            if snapshot is None:
+                raw = self._fetch_raw(actual_table)
             else:
-                return pd.DataFrame()
-                
+                raw, watermark = snapshot
+                dirty = False
+
+                # The overlap re-sends rows we already have - only merge real changes
+                since = (pd.Timestamp(watermark) - pd.Timedelta(seconds=SYNC_OVERLAP_SECONDS)).isoformat()
+                changed = self._fetch_raw(actual_table, since=since)
+                if not changed.empty:
+                    known_stamps = raw.set_index('id')['updated_at']
+                    changed = changed[changed['updated_at'].ne(changed['id'].map(known_stamps))]
+                if not changed.empty:
+                    raw = self._in_order(actual_table, pd.concat([raw[~raw['id'].isin(changed['id'])], changed], ignore_index=True))
+                    dirty = True
+
+                remote_count = self.client.table(actual_table).select("id", count="exact").limit(1).execute().count
+                if remote_count is not None and remote_count != len(raw):
+                    raw = self._fetch_raw(actual_table)
+                    dirty = True
+
+            # Tables without id/updated_at can't be synced - keep re-reading them in full
+            if not raw.empty and {'id', 'updated_at'}.issubset(raw.columns):
+                self._snapshots[actual_table] = (raw, self._watermark(raw))
+                if dirty:
+                    self._write_snapshot_file(actual_table, raw)
+
+            return raw
+
+    def _load_frame(self, sheet_name, incremental=False, **query):
+        """Fetch one table as a Title_Case frame. Raises on failure (safe to run off-thread)."""
+        actual_table = self._table(sheet_name)
+
+        if actual_table == "event_summary" and self.local_summary:
+            raw = query_event_summary({
+                t: self._sync_table(t) if self._can_sync(t) else self._fetch_raw(t) for t in SUMMARY_SOURCES
+            }, **query)
+        # Filtered reads go straight to the server - the snapshot holds whole tables only
+        elif any(query.values()):
+            raw = self._fetch_raw(actual_table, **query)
+        elif incremental and self._can_sync(actual_table):
+            raw = self._sync_table(actual_table)
+        else:
+            raw = self._fetch_raw(actual_table)
+
+        if raw.empty:
+            return pd.DataFrame()
+        # One vectorized dtype pass per load (dates, numbers, PINs) - see modules/schema.py
+        return coerce_frame(actual_table, self._to_sheet_frame(raw))
+
+    def read_table(self, sheet_name, incremental=False, columns=None, filters=None, date_range=None, order=None):
+        """
+        Read table as DataFrame - EXACT REPLACEMENT for get_data()
+
+        Maps your Google Sheets names to Supabase tables.
+        With incremental=True only rows changed since the last call are fetched
+        (for tables with the updated_at trigger - see _can_sync).
+
+        Optional server-side query (Title_Case names):
+            columns=["Event_ID", "Venue"]                 -> select only these
+            filters={"Event_ID": eid} / {"Event_ID": [..]} -> eq / in
+            date_range=("Date", start, None)              -> Date >= start
+            order=("Date", True)                          -> order by Date desc
+        """
+        try:
+            return self._load_frame(
+                sheet_name, incremental,
+                columns=columns, filters=filters, date_range=date_range, order=order
+            )
         except Exception as e:
             st.error(f"Error reading {sheet_name}: {e}")
             return pd.DataFrame()
-    
+
+    def read_tables(self, sheet_names, incremental=False, **query):
+        """
+        Fetch several tables concurrently - returns {sheet_name: DataFrame}.
+
+        Total latency is that of the slowest table rather than the sum.
+        Query keywords (see read_table) are applied server-side to every table.
+        Errors are reported here on the script thread, not in the workers.
+        """
+        sheet_names = list(dict.fromkeys(sheet_names))
+        if not sheet_names:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_READS, len(sheet_names))) as pool:
+            futures = {name: pool.submit(self._load_frame, name, incremental, **query) for name in sheet_names}
+
+        frames = {}
+        for name, future in futures.items():
+            try:
+                frames[name] = future.result()
+            except Exception as e:
+                st.error(f"Error reading {name}: {e}")
+                frames[name] = pd.DataFrame()
+        return frames
+
+    # ==========================================
+    # 🧊 CACHED READS
+    # ==========================================
+    def invalidate(self, *sheet_names):
+        """Mark tables as written so only cache entries built from them are refetched."""
+        self.cache.invalidate(*(self._table(name) for name in sheet_names))
+
+    def cached(self, key, sheet_names, loader):
+        """Cache any value derived from the given tables until one of them is written."""
+        return self.cache.get(key, [self._table(name) for name in sheet_names], loader)
+
+    def get_tables(self, sheet_names, **query):
+        """
+        Cached read_tables() - returns {sheet_name: DataFrame}.
+
+        Only tables whose entry is missing, expired or invalidated by a write
+        are fetched (in parallel, incrementally); the rest come from the cache.
+        """
+        query_key = repr(sorted(query.items()))
+        frames, pending = {}, {}
+        for name in dict.fromkeys(sheet_names):
+            table = self._table(name)
+            hit, frame, stamp = self.cache.lookup((table, query_key), [table])
+            if hit:
+                frames[name] = frame
+            else:
+                pending[name] = stamp
+
+        if pending:
+            fresh = self.read_tables(pending, incremental=True, **query)
+            for name, stamp in pending.items():
+                table = self._table(name)
+                frames[name] = self.cache.store((table, query_key), [table], stamp, fresh[name])
+        return frames
+
+    def read_event_bundle(self, eid):
+        """Fetch only the rows for one Event_ID from every child table, in one parallel batch."""
+        frames = self.read_tables(BUNDLE_TABLES.values(), filters={"Event_ID": str(eid)})
+        return EventBundle.from_frames(eid, frames)
+
+    def iter_table(self, sheet_name, chunk_size=PAGE_SIZE, **query):
+        """
+        Stream a table as Title_Case DataFrame chunks of at most chunk_size rows.
+
+        Use for exports/aggregations over large tables (event_sales,
+        event_staffing) that don't need the whole frame in memory at once.
+        Accepts the same query keywords as read_table.
+        """
+        actual_table = self._table(sheet_name)
+
+        try:
+            for chunk in self._iter_raw(actual_table, chunk_size=chunk_size, **query):
+                yield coerce_frame(actual_table, self._to_sheet_frame(chunk))
+        except Exception as e:
+            st.error(f"Error reading {sheet_name}: {e}")
+
     def update_table(self, sheet_name, dataframe):
         """
         Update table - EXACT REPLACEMENT for conn.update()
+
+        Rewrites the whole table. Prefer insert_row / upsert_row /
+        delete_rows for single-record saves.
         """
-        table_map = {
-            "Staff": "staff",
-            "Events": "events",
-            "Event_Financials": "event_financials",
-            "Event_Contacts": "event_contacts",
-            "Logistics_Details": "logistics_details",
-            "Event_Reports": "event_reports",
-            "Inventory": "inventory",
-            "Event_Sales": "event_sales",
-            "Event_Staffing": "event_staffing",
-            "Staff_Database": "staff_database"
-        }
-        
-        actual_table = table_map.get(sheet_name, sheet_name.lower())
-        
+        actual_table = self._table(sheet_name)
+
         try:
-            # Convert Title_Case to lowercase_underscore for Supabase
-            reverse_column_map = {
-                # Staff
-                "Email": "email",
-                "Name": "name",
-                "Role": "role",
-                "PIN": "pin",
-                "Type": "type",
-                "Phone": "phone",
-                "Photo": "photo",
-                
-                # Events
-                "Event_ID": "event_id",
-                "Date": "date",
-                "End_Date": "end_date",
-                "Venue": "venue",
-                "Address": "address",
-                "Maps_Link": "maps_link",
-                "Status": "status",
-                "Is_Multi_Day": "is_multi_day",
-                "Contact_Type": "contact_type",
-                "Notes": "notes",
-                "Last_Edited_By": "last_edited_by",
-                "Organiser_Name": "organiser_name",
-                "Event_Type": "event_type",
-                
-                # Financials
-                "Rent": "rent",
-                "Rent_Status": "rent_status",
-                "Rent_Paid_Date": "rent_paid_date",
-                "Rent_Due_Date": "rent_due_date",
-                "Cleaning_Deposit": "cleaning_deposit",
-                "Deposit_Paid": "deposit_paid",
-                "Deposit_Refunded": "deposit_refunded",
-                "Fee_Structure": "fee_structure",
-                "Commission_Rate": "commission_rate",
-                "Deposit": "deposit",
-                "Payment_Date": "payment_date",
-                "Due_Date": "due_date",
-                
-                # Contacts
-                "Contact_ID": "contact_id",
-                "Preferred_Method": "preferred_method",
-                "Pref_Method": "pref_method",
-                
-                # Logistics
-                "Bump_In": "bump_in",
-                "Bump_Out": "bump_out",
-                "Setup_Type": "setup_type",
-                "Power": "power",
-                "Water": "water",
-                "Comments": "comments",
-                
-                # Reports
-                "Report_Date": "report_date",
-                "Weather": "weather",
-                "Time_Leave": "time_leave",
-                "Time_Reach": "time_reach",
-                "Other_Stalls": "other_stalls",
-                "Water_Access": "water_access",
-                "Power_Access": "power_access",
-                "General_Comments": "general_comments",
-                
-                # Inventory
-                "Item_Name": "item_name",
-                "Start_Qty": "start_qty",
-                "End_Qty": "end_qty",
-                "Sold_Qty": "sold_qty",
-                "Waste": "waste",
-                
-                # Sales
-                "Opening_Float": "opening_float",
-                "Cash_Sales": "cash_sales",
-                "Card_Sales": "card_sales",
-                "Closing_Float": "closing_float",
-                "Total_Revenue": "total_revenue",
-                
-                # Staffing
-                "Staff_Name": "staff_name",
-                "Start_Time": "start_time",
-                "End_Time": "end_time",
-                "Break_Time": "break_time",
-                "Payment_Method": "payment_method",
-                "Payment_Status": "payment_status",
-                
-                # Staff Database
-                "Hourly_Rate": "hourly_rate",
-                "TFN": "tfn",
-                "Photo_URL": "photo_url",
-                "Skills": "skills",
-                "Rating": "rating"
-            }
-            
             # Rename columns for Supabase
-            df = dataframe.rename(columns=reverse_column_map)
-            
+            df = dataframe.rename(columns=REVERSE_COLUMN_MAP)
+
             # Convert to list of dicts
             records = df.to_dict('records')
-            
+
             # Clear table (matching Google Sheets behavior)
             self.client.table(actual_table).delete().neq('id', '00000000-0000-0000-0000-000000000000').execute()
-            
+
             # Insert in batches of 100
             for i in range(0, len(records), 100):
                 batch = records[i:i+100]
                 self.client.table(actual_table).insert(batch).execute()
-            
+
+            self.invalidate(sheet_name)
+            return True
+
+        except Exception as e:
+            st.error(f"Error updating {sheet_name}: {e}")
+            return False
+
+    # ==========================================
+    # ✏️ KEYED ROW WRITES
+    # ==========================================
+    def insert_row(self, sheet_name, row):
+        """Append a single row (Title_Case or snake_case keys)."""
+        actual_table = self._table(sheet_name)
+
+        try:
+            self.client.table(actual_table).insert(self._to_db_row(row)).execute()
+            self.invalidate(sheet_name)
+            return True
+        except Exception as e:
+            st.error(f"Error saving to {sheet_name}: {e}")
+            return False
+
+    def upsert_row(self, sheet_name, row, keys=None):
+        """
+        Update the row matching the natural key, inserting it if none exists.
+
+        keys defaults to NATURAL_KEYS for the table, e.g. (event_id, report_date)
+        for Event_Reports. One atomic INSERT ... ON CONFLICT, so it needs a
+        unique index on the key columns (sql/natural_keys.sql).
+        """
+        actual_table = self._table(sheet_name)
+        record = self._to_db_row(row)
+        key_cols = [REVERSE_COLUMN_MAP.get(k, k) for k in (keys or NATURAL_KEYS.get(actual_table, []))]
+
+        if not key_cols or any(k not in record for k in key_cols):
+            st.error(f"Error saving to {sheet_name}: missing key {key_cols}")
+            return False
+
+        try:
+            self.client.table(actual_table).upsert(record, on_conflict=",".join(key_cols)).execute()
+            self.invalidate(sheet_name)
+            return True
+        except Exception as e:
+            st.error(f"Error saving to {sheet_name}: {e}")
+            return False
+
+    def patch_rows(self, sheet_name, match, values):
+        """Update only the given columns on rows matching {column: value}."""
+        actual_table = self._table(sheet_name)
+
+        try:
+            self._filter(self.client.table(actual_table).update(self._to_db_row(values)), match).execute()
+            self.invalidate(sheet_name)
             return True
-            
         except Exception as e:
             st.error(f"Error updating {sheet_name}: {e}")
             return False
 
+    def delete_rows(self, sheet_name, match):
+        """Delete rows matching {column: value}. An empty match is refused."""
+        actual_table = self._table(sheet_name)
+
+        if not match:
+            st.error(f"Refusing to delete from {sheet_name} without a match.")
+            return False
+
+        try:
+            self._filter(self.client.table(actual_table).delete(), match).execute()
+            self.invalidate(sheet_name)
+            return True
+        except Exception as e:
+            st.error(f"Error deleting from {sheet_name}: {e}")
+            return False
+
 
 # ==========================================
 # CACHED CONNECTION
@@ -0,0 +1,122 @@
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+# Copy-on-Write lets every session share one cached frame: a page that does
+# df['Date'] = pd.to_datetime(...) only copies that column, never the cache.
+# Needs pandas >= 2 (pinned in requirements.txt); always on from 3.0, where
+# the option is deprecated.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+def _share(value):
+    """
+    Hand out a cached value without copying its data.
+
+    DataFrames (also those inside dataclasses like EventBundle) come back as
+    shallow views, so renaming columns or assigning to them in a page leaves
+    the shared frame untouched.
+    """
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=False)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.replace(value, **{
+            f.name: _share(getattr(value, f.name)) for f in dataclasses.fields(value) if f.init
+        })
+    return value
+
+
+class TableCache:
+    """
+    Process-wide cache of table reads with a version counter per table.
+
+    Values are stored once and shared by all sessions (see _share), instead
+    of being pickled and unpickled per call like st.cache_data.
+
+    Each entry remembers which tables it was built from and their versions
+    at load time. A write bumps only the written table's version, so only
+    entries that depend on it go stale - everything else stays warm for
+    every session. A TTL still covers edits made outside this process.
+
+    Expired entries are dropped on the next store(), and at most max_entries
+    are kept (least recently used go first), so per-event and per-filter
+    keys can't grow the process without bound.
+
+    derived maps a server-side view to the tables it is built from
+    ({"event_summary": ("events", ...)}), so writing a base table also
+    bumps the views that read it.
+    """
+
+    def __init__(self, ttl=60, derived=None, max_entries=512):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._dependents = {}
+        for view, sources in (derived or {}).items():
+            for source in sources:
+                self._dependents.setdefault(source, set()).add(view)
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._entries = OrderedDict()  # key -> (tables, stamp, stored_at, value), oldest use first
+
+    def _stamp(self, tables):
+        return tuple(self._versions.get(t, 0) for t in tables)
+
+    def version(self, table):
+        """Current version of a table (0 until its first write)."""
+        with self._lock:
+            return self._versions.get(table, 0)
+
+    def lookup(self, key, tables):
+        """Return (hit, value, stamp). Pass the stamp back to store() after a miss."""
+        tables = tuple(tables)
+        with self._lock:
+            stamp = self._stamp(tables)
+            entry = self._entries.get(key)
+            hit = entry is not None and entry[1] == stamp and time.monotonic() - entry[2] < self.ttl
+            if hit:
+                self._entries.move_to_end(key)
+
+        if hit:
+            return True, _share(entry[3]), stamp
+        return False, None, stamp
+
+    def store(self, key, tables, stamp, value):
+        """Keep a freshly loaded value - unless one of its tables was written meanwhile."""
+        tables = tuple(tables)
+        with self._lock:
+            now = time.monotonic()
+            if self._stamp(tables) == stamp:
+                self._entries[key] = (tables, stamp, now, value)
+                self._entries.move_to_end(key)
+            self._evict(now)
+        return _share(value)
+
+    def _evict(self, now):
+        """Drop expired entries, then the least recently used beyond max_entries (lock held)."""
+        expired = [key for key, entry in self._entries.items() if now - entry[2] >= self.ttl]
+        for key in expired:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key, tables, loader):
+        """Cached value for key, calling loader() on a miss or after a write to any of tables."""
+        hit, value, stamp = self.lookup(key, tables)
+        if hit:
+            return value
+        return self.store(key, tables, stamp, loader())
+
+    def invalidate(self, *tables):
+        """Bump the version of each table (and views over it) and drop the entries that depend on it."""
+        tables = set(tables).union(*(self._dependents.get(t, ()) for t in tables))
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+            self._entries = OrderedDict(
+                (key, entry) for key, entry in self._entries.items()
+                if not tables.intersection(entry[0])
+            )
@@ -1,13 +1,169 @@
+import hashlib
+import math
+import os
+import threading
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import streamlit as st
 
-def render_mini_map(address):
-    """Renders a consistent small Google Map preview."""
-    if address and str(address).lower() != 'nan' and address.strip() != "":
-        addr_enc = address.replace(' ', '%20')
-        map_url = f"https://maps.google.com/maps?q={addr_enc}&t=m&z=14&output=embed"
+# Card grid page sizes (multiples of the 3-column layout)
+GRID_PAGE_SIZES = [12, 24, 48, 96]
+
+# Static map thumbnails, fetched once per address (needs GOOGLE_MAPS_API_KEY)
+DEFAULT_THUMB_DIR = Path(__file__).resolve().parent.parent / ".map_thumbs"
+
+# Thumbnails are downloaded off the script thread, a couple at a time, so a
+# page of cards never waits on the Static Maps API
+_thumb_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="map-thumbs")
+_thumb_lock = threading.Lock()
+_pending_thumbs = set()
+_failed_thumbs = set()
+
+def _has_address(address):
+    return address is not None and str(address).strip() != "" and str(address).lower() != 'nan'
+
+def address_hash(address):
+    """Stable short id for an address (thumbnail file names, widget keys)."""
+    return hashlib.sha1(str(address).strip().lower().encode()).hexdigest()[:16]
+
+def _map_iframe(address):
+    addr_enc = urllib.parse.quote(address)
+    map_url = f"https://maps.google.com/maps?q={addr_enc}&t=m&z=14&output=embed"
+    st.markdown(f"""
+        <div style="border-radius: 10px; overflow: hidden; margin-bottom: 10px; border: 1px solid #ddd;">
+            <iframe width="100%" height="150" src="{map_url}" frameborder="0" style="border:0;" loading="lazy"></iframe>
+        </div>
+    """, unsafe_allow_html=True)
+
+def _fetch_thumbnail(address, path, api_key):
+    """Download one static map PNG to path (runs on the thumbnail pool)."""
+    params = urllib.parse.urlencode({
+        "center": address, "zoom": 14, "size": "400x150", "scale": 2,
+        "markers": address, "key": api_key,
+    })
+    try:
+        with urllib.request.urlopen(f"https://maps.googleapis.com/maps/api/staticmap?{params}", timeout=5) as resp:
+            data = resp.read()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except Exception:
+        with _thumb_lock:
+            _failed_thumbs.add(path)
+    finally:
+        with _thumb_lock:
+            _pending_thumbs.discard(path)
+
+def _static_thumbnail(address):
+    """
+    Path of a cached static map PNG for the address, or None.
+
+    Only ever reads the disk cache. A missing thumbnail is queued for a
+    background download and shows up on a later rerun; until then (and
+    without an API key, or if the fetch fails) the text placeholder is
+    shown instead.
+    """
+    thumb_dir = Path(st.secrets.get("MAP_THUMB_DIR", DEFAULT_THUMB_DIR))
+    path = thumb_dir / f"{address_hash(address)}.png"
+    if path.exists():
+        return path
+
+    api_key = st.secrets.get("GOOGLE_MAPS_API_KEY")
+    if not api_key:
+        return None
+
+    with _thumb_lock:
+        if path in _failed_thumbs or path in _pending_thumbs:
+            return None
+        _pending_thumbs.add(path)
+    _thumb_pool.submit(_fetch_thumbnail, address, path, api_key)
+    return None
+
+def render_mini_map(address, key=None, lazy=False):
+    """
+    Renders a consistent small Google Map preview.
+
+    lazy=True (card grids) shows a cached static thumbnail or a light
+    placeholder, and only embeds the live map once the user asks for it.
+    """
+    if not _has_address(address):
+        return
+    address = str(address).strip()
+
+    if not lazy:
+        _map_iframe(address)
+        return
+
+    if st.toggle("🗺️ Show map", key=f"map_{key or address_hash(address)}"):
+        _map_iframe(address)
+        return
+
+    thumb = _static_thumbnail(address)
+    if thumb:
+        st.image(str(thumb), use_container_width=True)
+    else:
+        link = f"https://www.google.com/maps/search/?api=1&query={urllib.parse.quote(address)}"
         st.markdown(f"""
-            <div style="border-radius: 10px; overflow: hidden; margin-bottom: 10px; border: 1px solid #ddd;">
-                <iframe width="100%" height="150" src="{map_url}" frameborder="0" style="border:0;"></iframe>
-            </div>
+            <a href="{link}" target="_blank" style="text-decoration: none;">
+                <div style="background-color: #f1f3f4; color: #5f6368; padding: 8px; border-radius: 10px; text-align: center; font-size: 0.75rem; border: 1px solid #ddd; margin-bottom: 10px;">
+                    📍 {address}
+                </div>
+            </a>
         """, unsafe_allow_html=True)
-        
\ No newline at end of file
+
+def render_event_map(points, height=350):
+    """
+    One interactive map with a point per event (Lat/Lon/Venue/Date columns),
+    in place of an embedded Google Map per card.
+    """
+    if points.empty:
+        st.caption("📍 No mapped venues yet.")
+        return
+
+    import pydeck as pdk
+
+    data = points.assign(Day=points['Date'].dt.strftime('%a %d %b'))[['Venue', 'Address', 'Day', 'Lat', 'Lon']]
+    layer = pdk.Layer(
+        "ScatterplotLayer", data=data, get_position="[Lon, Lat]",
+        get_fill_color=[255, 75, 75, 200], get_radius=250, radius_min_pixels=6, pickable=True,
+    )
+    view = pdk.ViewState(latitude=data['Lat'].mean(), longitude=data['Lon'].mean(), zoom=9)
+    st.pydeck_chart(pdk.Deck(
+        layers=[layer], initial_view_state=view, map_style=None,
+        tooltip={"text": "{Venue}\n{Day}\n{Address}"},
+    ), height=height)
+
+def paginate(dataframe, key, reset_on=None, page_sizes=GRID_PAGE_SIZES):
+    """
+    Returns only the current page of a card grid and draws its controls.
+
+    Widgets and map iframes are then built for one page per rerun, however
+    long the archive gets. The page jumps back to 1 whenever reset_on
+    (e.g. the active search/filters) changes.
+    """
+    page_key, filters_key = f"{key}_page", f"{key}_filters"
+    if st.session_state.get(filters_key) != reset_on:
+        st.session_state[filters_key] = reset_on
+        st.session_state[page_key] = 0
+
+    total = len(dataframe)
+    if total <= page_sizes[0]:
+        return dataframe
+
+    c_prev, c_info, c_size, c_next = st.columns([1, 2, 1, 1])
+    page_size = c_size.selectbox("Per page", page_sizes, key=f"{key}_size", label_visibility="collapsed")
+    n_pages = math.ceil(total / page_size)
+    page = st.session_state[page_key] = min(st.session_state.get(page_key, 0), n_pages - 1)
+
+    def _step(delta):
+        st.session_state[page_key] += delta
+
+    c_prev.button("◀ Prev", key=f"{key}_prev", disabled=page == 0, on_click=_step, args=(-1,), use_container_width=True)
+    c_next.button("Next ▶", key=f"{key}_next", disabled=page >= n_pages - 1, on_click=_step, args=(1,), use_container_width=True)
+
+    c_info.markdown(f"<div style='text-align:center; padding-top:8px;'>Page <b>{page + 1}</b> of {n_pages}</div>", unsafe_allow_html=True)
+    return dataframe.iloc[page * page_size:(page + 1) * page_size]
@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import streamlit as st
+
+from modules.ui_utils import address_hash
+
+# Nominatim usage policy: at most one request per second, with a real User-Agent
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+USER_AGENT = "TwistedEventHub/1.0"
+GEOCODE_INTERVAL = 1.0
+
+# New addresses queued per page load - the rest are picked up on later reruns
+MAX_GEOCODES_PER_RUN = 5
+
+# After a failed lookup Nominatim is left alone for this long, doubling per
+# consecutive failure up to the cap
+BACKOFF_START, BACKOFF_MAX = 60.0, 3600.0
+
+_geocode_lock = threading.Lock()
+_last_geocode = 0.0
+
+# Geocoding runs on one background worker, never on a page render
+_geocode_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="geocode")
+_queue_lock = threading.Lock()
+_queued = set()
+_backoff = {"until": 0.0, "delay": 0.0}
+
+
+def geocoding_enabled():
+    """Addresses are only sent to Nominatim when GEOCODE_VENUES is set in secrets."""
+    return bool(st.secrets.get("GEOCODE_VENUES", False))
+
+
+def geocode(address):
+    """
+    (lat, lon) for an address via Nominatim, or (None, None) if not found.
+
+    Calls are serialized and spaced GEOCODE_INTERVAL apart across all
+    sessions. Network errors propagate so the address is retried later.
+    """
+    global _last_geocode
+
+    params = urllib.parse.urlencode({"q": address, "format": "json", "limit": 1})
+    request = urllib.request.Request(f"{NOMINATIM_URL}?{params}", headers={"User-Agent": USER_AGENT})
+
+    with _geocode_lock:
+        wait = GEOCODE_INTERVAL - (time.monotonic() - _last_geocode)
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            with urllib.request.urlopen(request, timeout=5) as resp:
+                results = json.load(resp)
+        finally:
+            _last_geocode = time.monotonic()
+
+    if not results:
+        return None, None
+    return float(results[0]["lat"]), float(results[0]["lon"])
+
+
+def _geocode_batch(rows, db):
+    """
+    Geocode and save a batch of {Address_Hash, Address} rows (runs on the
+    geocode worker). Stops at the first network error and backs off.
+    """
+    try:
+        for row in rows:
+            if time.monotonic() < _backoff["until"]:
+                return
+            try:
+                lat, lon = geocode(row["Address"])
+            except Exception:
+                with _queue_lock:
+                    _backoff["delay"] = min(BACKOFF_MAX, max(BACKOFF_START, _backoff["delay"] * 2))
+                    _backoff["until"] = time.monotonic() + _backoff["delay"]
+                return
+            with _queue_lock:
+                _backoff["delay"] = 0.0
+            db.upsert_row("Venues", {**row, "Lat": lat, "Lon": lon})
+    finally:
+        with _queue_lock:
+            _queued.difference_update(row["Address_Hash"] for row in rows)
+
+
+def queue_geocodes(missing, db):
+    """Hand up to MAX_GEOCODES_PER_RUN unknown addresses to the background worker."""
+    with _queue_lock:
+        if time.monotonic() < _backoff["until"]:
+            return
+        rows = [
+            {"Address_Hash": h, "Address": a}
+            for h, a in zip(missing["Address_Hash"], missing["Address"]) if h not in _queued
+        ][:MAX_GEOCODES_PER_RUN]
+        _queued.update(row["Address_Hash"] for row in rows)
+    if rows:
+        _geocode_pool.submit(_geocode_batch, rows, db)
+
+
+def venue_points(df_events, get_data, db):
+    """
+    One map point per event (Event_ID, Venue, Date, Address, Lat, Lon).
+
+    Coordinates come from the Venues table, keyed by address hash, so each
+    address is geocoded once ever rather than rendered as its own map.
+    With GEOCODE_VENUES on, unknown addresses are queued for the background
+    geocoder (a few per run) and appear once it has saved them to Venues;
+    addresses it can't resolve are saved without coordinates so they are
+    not looked up again. The render itself never waits on the network.
+    """
+    if df_events.empty:
+        return pd.DataFrame(columns=["Event_ID", "Venue", "Date", "Address", "Lat", "Lon"])
+
+    events = df_events[["Event_ID", "Venue", "Date"]].assign(
+        Address=df_events.get("Address", df_events["Venue"]).fillna(df_events["Venue"]).astype(str).str.strip()
+    )
+    events = events[events["Address"].ne("") & events["Address"].str.lower().ne("nan")]
+    events = events.assign(Address_Hash=events["Address"].map(address_hash))
+
+    venues = get_data("Venues")
+    known = venues[["Address_Hash", "Lat", "Lon"]] if not venues.empty else pd.DataFrame(columns=["Address_Hash", "Lat", "Lon"])
+
+    missing = events.drop_duplicates("Address_Hash")
+    missing = missing[~missing["Address_Hash"].isin(set(known["Address_Hash"]))]
+
+    if not missing.empty and geocoding_enabled():
+        queue_geocodes(missing, db)
+
+    known = known[["Address_Hash", "Lat", "Lon"]].astype({"Lat": float, "Lon": float}).dropna(subset=["Lat", "Lon"])
+    points = events.merge(known.drop_duplicates("Address_Hash"), on="Address_Hash", how="inner")
+    return points.drop(columns="Address_Hash")
@@ -0,0 +1,69 @@
+-- One denormalized row per event with every field the hub/archive cards show.
+-- The app reads it as the "Event_Summary" table (see modules/event_cards.py).
+--
+-- Plain ANSI SQL with window functions so the same file runs on Postgres
+-- (Supabase) and SQLite 3.25+ (modules/local_summary.py). Being a view it is
+-- always current - no refresh job. "First" child row = earliest created_at
+-- (id breaks ties), the first row the app saw when tables were read in
+-- insertion order. Two contact columns, matching what each grid showed:
+-- primary_contact_name (hub) is the Primary Contact only, NULL without one;
+-- first_contact_name (archive) is the first contact of any role.
+drop view if exists event_summary;
+
+create view event_summary as
+with fin as (
+    select event_id, rent_status, rent,
+           row_number() over (partition by event_id order by created_at, id) as rn
+    from event_financials
+),
+pcon as (
+    select event_id, name,
+           row_number() over (partition by event_id order by created_at, id) as rn
+    from event_contacts
+    where role = 'Primary Contact'
+),
+fcon as (
+    select event_id, name,
+           row_number() over (partition by event_id order by created_at, id) as rn
+    from event_contacts
+),
+lg as (
+    select event_id, setup_type, bump_in, bump_out,
+           row_number() over (partition by event_id order by created_at, id) as rn
+    from logistics_details
+),
+rep as (
+    select event_id, weather,
+           row_number() over (partition by event_id order by created_at, id) as rn
+    from event_reports
+)
+select
+    e.id,
+    e.created_at,
+    e.event_id,
+    e.date,
+    e.end_date,
+    e.venue,
+    e.address,
+    e.maps_link,
+    e.status,
+    e.is_multi_day,
+    e.organiser_name,
+    e.event_type,
+    fin.rent_status,
+    fin.rent,
+    pcon.name as primary_contact_name,
+    fcon.name as first_contact_name,
+    lg.setup_type,
+    lg.bump_in,
+    lg.bump_out,
+    rep.weather,
+    lg.event_id is not null as has_logistics,
+    rep.event_id is not null as has_report
+from events e
+left join fin on fin.event_id = e.event_id and fin.rn = 1
+left join pcon on pcon.event_id = e.event_id and pcon.rn = 1
+left join fcon on fcon.event_id = e.event_id and fcon.rn = 1
+left join lg on lg.event_id = e.event_id and lg.rn = 1
+left join rep on rep.event_id = e.event_id and rep.rn = 1;
+
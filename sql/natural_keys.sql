@@ -0,0 +1,19 @@
+-- Unique index on each table's natural key (NATURAL_KEYS in modules/schema.py).
+-- upsert_row saves with INSERT ... ON CONFLICT on these columns, so two
+-- concurrent saves of the same record update one row instead of inserting two.
+-- event_sales (event_id, sale_date) and venues (address_hash) already have
+-- theirs - see sales_ledger.sql and venues.sql.
+--
+-- Creating an index fails if the table already holds duplicate keys. Find
+-- them first, e.g.:
+--   select event_id, report_date, count(*) from event_reports
+--   group by 1, 2 having count(*) > 1;
+create unique index if not exists events_key on events (event_id);
+create unique index if not exists event_financials_key on event_financials (event_id);
+create unique index if not exists event_contacts_key on event_contacts (contact_id);
+create unique index if not exists logistics_details_key on logistics_details (event_id);
+create unique index if not exists event_reports_key on event_reports (event_id, report_date);
+create unique index if not exists inventory_key on inventory (event_id, item_name);
+create unique index if not exists event_staffing_key on event_staffing (event_id, staff_name);
+create unique index if not exists staff_key on staff (email);
+create unique index if not exists staff_database_key on staff_database (staff_name);
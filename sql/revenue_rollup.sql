@@ -0,0 +1,92 @@
+-- Revenue rollup cube for the History page, kept up to date by a trigger on
+-- event_sales: each insert/update/delete adds its delta to the matching
+-- day, week and month cells, so history is never rescanned.
+--
+-- Cells are keyed by (grain, period, venue, event_type, setup_type) with
+-- 'Unknown' for missing dimensions. Ledger rows without a sale_date (legacy
+-- Sheets imports) count on the event's start date. Dimensions are captured
+-- at sale time - run select rebuild_revenue_rollup(); after renaming venues
+-- or re-typing past events.
+create table if not exists revenue_rollup (
+    id uuid primary key default gen_random_uuid(),
+    grain text not null check (grain in ('day', 'week', 'month')),
+    period date not null,
+    venue text not null,
+    event_type text not null,
+    setup_type text not null,
+    revenue numeric not null default 0,
+    sales_days integer not null default 0,
+    created_at timestamptz not null default now(),
+    updated_at timestamptz not null default now(),
+    unique (grain, period, venue, event_type, setup_type)
+);
+
+create or replace function apply_revenue_delta(p_event_id text, p_sale_date date, p_amount numeric, p_days integer)
+returns void language plpgsql as $$
+declare
+    v_day date;
+    v_venue text;
+    v_type text;
+    v_setup text;
+    v_grain text;
+begin
+    select coalesce(p_sale_date, e.date::date),
+           coalesce(e.venue, 'Unknown'),
+           coalesce(e.event_type, 'Unknown'),
+           coalesce((select l.setup_type from logistics_details l
+                     where l.event_id = e.event_id order by l.id limit 1), 'Unknown')
+      into v_day, v_venue, v_type, v_setup
+      from events e
+     where e.event_id = p_event_id
+     limit 1;
+
+    v_day := coalesce(v_day, p_sale_date);
+    if v_day is null then
+        return;
+    end if;
+
+    foreach v_grain in array array['day', 'week', 'month'] loop
+        insert into revenue_rollup (grain, period, venue, event_type, setup_type, revenue, sales_days)
+        values (
+            v_grain,
+            case when v_grain = 'day' then v_day else date_trunc(v_grain, v_day)::date end,
+            coalesce(v_venue, 'Unknown'), coalesce(v_type, 'Unknown'), coalesce(v_setup, 'Unknown'),
+            p_amount, p_days
+        )
+        on conflict (grain, period, venue, event_type, setup_type) do update
+            set revenue = revenue_rollup.revenue + excluded.revenue,
+                sales_days = revenue_rollup.sales_days + excluded.sales_days,
+                updated_at = now();
+    end loop;
+end;
+$$;
+
+create or replace function event_sales_rollup()
+returns trigger language plpgsql as $$
+begin
+    if tg_op in ('UPDATE', 'DELETE') then
+        perform apply_revenue_delta(old.event_id, old.sale_date, -coalesce(old.total_revenue, 0), -1);
+    end if;
+    if tg_op in ('INSERT', 'UPDATE') then
+        perform apply_revenue_delta(new.event_id, new.sale_date, coalesce(new.total_revenue, 0), 1);
+    end if;
+    return null;
+end;
+$$;
+
+drop trigger if exists event_sales_rollup on event_sales;
+create trigger event_sales_rollup
+    after insert or update or delete on event_sales
+    for each row execute function event_sales_rollup();
+
+-- One-off backfill (and repair after dimension changes)
+create or replace function rebuild_revenue_rollup()
+returns void language plpgsql as $$
+begin
+    delete from revenue_rollup;
+    perform apply_revenue_delta(event_id, sale_date, coalesce(total_revenue, 0), 1)
+       from event_sales;
+end;
+$$;
+
+select rebuild_revenue_rollup();
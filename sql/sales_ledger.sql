@@ -0,0 +1,64 @@
+-- Dated sales ledger: one event_sales row per (event_id, sale_date) with the
+-- category split from the Sales tab, plus the totals the app reads.
+-- Rows migrated from Sheets have no sale_date; they still count towards the
+-- event, venue and all-time totals.
+alter table event_sales add column if not exists sale_date date;
+alter table event_sales add column if not exists quick_sales numeric default 0;
+alter table event_sales add column if not exists food_sales numeric default 0;
+alter table event_sales add column if not exists drinks_sales numeric default 0;
+alter table event_sales add column if not exists uncategorised_sales numeric default 0;
+
+create unique index if not exists event_sales_event_day
+    on event_sales (event_id, sale_date);
+
+-- Day totals (read as "Sales_Daily")
+drop view if exists sales_daily;
+create view sales_daily as
+select
+    min(id::text) as id,
+    event_id,
+    sale_date,
+    sum(card_sales) as card_sales,
+    sum(cash_sales) as cash_sales,
+    sum(quick_sales) as quick_sales,
+    sum(food_sales) as food_sales,
+    sum(drinks_sales) as drinks_sales,
+    sum(uncategorised_sales) as uncategorised_sales,
+    sum(total_revenue) as total_revenue
+from event_sales
+where sale_date is not null
+group by event_id, sale_date;
+
+-- Event totals to date (read as "Sales_By_Event")
+drop view if exists sales_by_event;
+create view sales_by_event as
+select
+    min(id::text) as id,
+    event_id,
+    count(sale_date) as trading_days,
+    sum(total_revenue) as total_revenue
+from event_sales
+group by event_id;
+
+-- Venue totals across all events (read as "Sales_By_Venue")
+drop view if exists sales_by_venue;
+create view sales_by_venue as
+select
+    min(e.id::text) as id,
+    e.venue,
+    count(distinct s.event_id) as events,
+    sum(s.total_revenue) as total_revenue
+from event_sales s
+join events e on e.event_id = s.event_id
+group by e.venue;
+
+-- Month totals, by sale date (read as "Sales_By_Month")
+drop view if exists sales_by_month;
+create view sales_by_month as
+select
+    to_char(sale_date, 'YYYY-MM') as id,
+    to_char(sale_date, 'YYYY-MM') as month,
+    sum(total_revenue) as total_revenue
+from event_sales
+where sale_date is not null
+group by to_char(sale_date, 'YYYY-MM');
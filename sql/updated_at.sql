@@ -0,0 +1,50 @@
+-- Stamp updated_at on every UPDATE of the tables the app syncs incrementally.
+-- _sync_table in modules/supabase_db.py only re-fetches rows whose updated_at
+-- moved past its watermark, so an edit that leaves the column untouched would
+-- never reach the local copy. The app asks updated_at_tables() which tables
+-- carry the trigger and reads the rest in full.
+--
+-- Tables that don't exist yet are skipped, so this can run before
+-- venues.sql / revenue_rollup.sql. Re-run it after those (it is idempotent)
+-- so their tables get the trigger too.
+create or replace function set_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at = now();
+    return new;
+end;
+$$;
+
+do $$
+declare
+    t text;
+begin
+    foreach t in array array[
+        'staff', 'events', 'event_financials', 'event_contacts', 'logistics_details',
+        'event_reports', 'inventory', 'event_sales', 'event_staffing', 'staff_database',
+        'venues', 'revenue_rollup'
+    ] loop
+        continue when to_regclass(format('public.%I', t)) is null;
+        execute format('alter table %I add column if not exists updated_at timestamptz not null default now()', t);
+        execute format('drop trigger if exists set_updated_at on %I', t);
+        execute format(
+            'create trigger set_updated_at before update on %I for each row execute function set_updated_at()', t
+        );
+    end loop;
+end;
+$$;
+
+-- Tables whose updated_at is maintained by the trigger above
+create or replace function updated_at_tables()
+returns table (table_name text)
+language sql
+stable
+as $$
+    select c.relname::text
+    from pg_trigger tg
+    join pg_class c on c.oid = tg.tgrelid
+    join pg_namespace n on n.oid = c.relnamespace
+    where tg.tgname = 'set_updated_at' and n.nspname = 'public' and not tg.tgisinternal;
+$$;
@@ -0,0 +1,12 @@
+-- Geocoded venue coordinates, one row per distinct event address.
+-- Filled lazily by modules/venues.py the first time an address is mapped;
+-- lat/lon stay NULL for addresses the geocoder could not resolve.
+create table if not exists venues (
+    id uuid primary key default gen_random_uuid(),
+    address_hash text not null unique,
+    address text not null,
+    lat double precision,
+    lon double precision,
+    created_at timestamptz not null default now(),
+    updated_at timestamptz not null default now()
+);